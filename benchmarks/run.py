@@ -0,0 +1,225 @@
+"""
+Benchmarks for request building, parsing and paging against a local mock API.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --records 50000 --latency 0.05 --compare benchmarks/results/<earlier>.json
+
+``base_request`` counts built requests rather than records. Every run is saved under ``benchmarks/results`` (or ``--out``) so later versions
+can be compared with ``--compare``.
+"""
+
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from loguru import logger
+
+from checkbooknyc import CheckbookNYC, Contracts
+from checkbooknyc.data_params import PARAMS
+
+from .server import MockServer, transaction
+
+RESULTS = Path(__file__).parent / "results"
+
+
+def measure(run: Callable[[], Iterable[Any]], count: Callable[[Any], int] = len):
+    """
+    Consumes the batches produced by ``run()`` and returns its throughput, time
+    to the first batch and peak traced memory. Memory is traced in a separate
+    pass so tracing does not distort the timings.
+    """
+    start = time.perf_counter()
+    first = None
+    records = 0
+    for batch in run():
+        if first is None:
+            first = time.perf_counter() - start
+        records += count(batch)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        for _ in run():
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "records": records,
+        "seconds": round(seconds, 6),
+        "records_per_second": round(records / seconds, 1) if seconds else None,
+        "time_to_first_record": round(first, 6) if first is not None else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def _fetch_page(client: CheckbookNYC, data_type: str, size: int, **kwargs):
+    endpoint = client.endpoint(data_type)
+    if isinstance(endpoint, Contracts):
+        return endpoint.fetch("active", "all", 1, size, **kwargs)
+    return endpoint.fetch(1, size, **kwargs)
+
+
+def run(
+    records: int = 10_000,
+    page_size: int = 2_000,
+    latency: float = 0.0,
+    workers: int = 1,
+    data_types: Optional[List[str]] = None,
+    processes: int = 0,
+    compress: bool = False,
+) -> Dict[str, Any]:
+    data_types = data_types or list(PARAMS)
+    results: Dict[str, Any] = {}
+
+    body = (
+        "<response><transactions>"
+        + "".join(transaction("Spending", n) for n in range(page_size))
+        + "</transactions></response>"
+    )
+    parser = CheckbookNYC().spending
+    results["parse"] = measure(lambda: [parser._parse(body)])
+
+    def requests():
+        for n in range(records):
+            yield [
+                parser._base_request(
+                    "Spending",
+                    [{"name": "fiscal_year", "type": "value", "value": str(n)}],
+                    n * page_size + 1,
+                    page_size,
+                )
+            ]
+
+    results["base_request"] = measure(requests)
+
+    with MockServer(records=records, latency=latency, compress=compress) as server:
+        client = CheckbookNYC(base_url=server.url)
+        for data_type in data_types:
+            logger.info(f"Benchmarking {data_type}.")
+            results[f"fetch[{data_type}]"] = measure(
+                lambda: [_fetch_page(client, data_type, page_size)]
+            )
+            results[f"fetch_stream[{data_type}]"] = measure(
+                lambda: _fetch_page(client, data_type, page_size, stream=True),
+                count=lambda record: 1,
+            )
+            results[f"fetch_all[{data_type}]"] = measure(
+                lambda: client.pages(
+                    data_type,
+                    page_size=page_size,
+                    workers=workers,
+                    processes=processes,
+                )
+            )
+
+    return results
+
+
+def _version() -> str:
+    try:
+        return version("checkbooknyc")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Returns the benchmarks whose throughput dropped by more than ``threshold``
+    (a fraction) relative to ``baseline``.
+    """
+    regressions = []
+    for name, result in current.items():
+        before = baseline.get(name, {}).get("records_per_second")
+        now = result["records_per_second"]
+        if not before or now is None:
+            continue
+        change = now / before - 1
+        print(f"{name:<32} {before:>14,.0f} -> {now:>14,.0f} rec/s ({change:+.1%})")
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=2_000)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds per response."
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--processes", type=int, default=0, help="Parse pages in worker processes."
+    )
+    parser.add_argument("--data-types", nargs="*", choices=list(PARAMS))
+    parser.add_argument(
+        "--compress", action="store_true", help="Serve gzip-encoded responses."
+    )
+    parser.add_argument("--out", type=Path, default=RESULTS)
+    parser.add_argument("--compare", type=Path, help="Earlier results file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Throughput drop counted as a regression.",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.records,
+        args.page_size,
+        args.latency,
+        args.workers,
+        args.data_types,
+        args.processes,
+        args.compress,
+    )
+    report = {
+        "version": _version(),
+        "python": platform.python_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "records": args.records,
+            "page_size": args.page_size,
+            "latency": args.latency,
+            "workers": args.workers,
+            "processes": args.processes,
+            "compress": args.compress,
+        },
+        "results": results,
+    }
+    args.out.mkdir(parents=True, exist_ok=True)
+    path = args.out / f"{report['timestamp'].replace(':', '')}-{report['version']}.json"
+    path.write_text(json.dumps(report, indent=2))
+    for name, result in results.items():
+        print(
+            f"{name:<32} {result['records_per_second'] or 0:>14,.0f} rec/s "
+            f"first {result['time_to_first_record'] or 0:.4f}s "
+            f"peak {result['peak_memory_bytes'] / 1024**2:.1f} MiB"
+        )
+    print(f"Saved results to {path}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("config") != report["config"]:
+            logger.warning("Baseline was run with a different configuration.")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from xml.etree import ElementTree as ET
+import gzip
+import threading
+import time
+
+from checkbooknyc.data_params import PARAMS
+from checkbooknyc.records import YEAR_FIELDS
+
+
+def _value(data_type: str, field: str, n: int) -> str:
+    if field.endswith("_date"):
+        return f"20{n % 20 + 5:02d}-{n % 12 + 1:02d}-{n % 28 + 1:02d}"
+    if field in YEAR_FIELDS:
+        return str(2010 + n % 15)
+    if PARAMS[data_type][field] == "range":
+        return f"{(n * 7919) % 1_000_000}.{n % 100:02d}"
+    if field.endswith("_code"):
+        return f"{n % 999:03d}"
+    return f"{field.replace('_', ' ').upper()} {n % 1000}"
+
+
+def transaction(data_type: str, n: int) -> str:
+    """
+    Renders synthetic transaction ``n`` with a value for every filter field of
+    ``data_type``.
+    """
+    return (
+        "<transaction>"
+        + "".join(
+            f"<{field}>{_value(data_type, field, n)}</{field}>"
+            for field in PARAMS[data_type]
+        )
+        + "</transaction>"
+    )
+
+
+class MockServer:
+    """
+    Local stand-in for the Checkbook NYC API. Each data type holds ``records``
+    synthetic transactions (``totals`` overrides this per data type) and every
+    response is delayed by ``latency`` seconds. ``records_from`` and
+    ``max_records`` are honoured like the real API, so the clients page through
+    it unchanged, and ``value`` filters on the data type's fields are applied.
+    With ``compress`` responses are gzipped for clients that accept it; gzipped
+    request bodies are always accepted.
+    """
+
+    def __init__(
+        self,
+        records: int = 10_000,
+        latency: float = 0.0,
+        totals: Optional[Dict[str, int]] = None,
+        compress: bool = False,
+    ):
+        self.records = records
+        self.latency = latency
+        self.totals = totals or {}
+        self.compress = compress
+        self.requests = 0
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def body(self, request: bytes) -> bytes:
+        root = ET.fromstring(request)
+        data_type = root.findtext("type_of_data")
+        if data_type not in PARAMS:
+            return b"<response><status><result>failure</result></status></response>"
+        total = self.totals.get(data_type, self.records)
+        matches = range(total)
+        filters = {
+            c.findtext("name"): c.findtext("value")
+            for c in root.iter("criteria")
+            if c.findtext("name") in PARAMS[data_type] and c.find("value") is not None
+        }
+        if filters:
+            matches = [
+                n
+                for n in matches
+                if all(_value(data_type, f, n) == v for f, v in filters.items())
+            ]
+        start = int(root.findtext("records_from") or 1) - 1
+        stop = start + int(root.findtext("max_records") or 1000)
+        rows = "".join(transaction(data_type, n) for n in matches[start:stop])
+        return (
+            "<response><status><result>success</result></status>"
+            f"<result_records><record_count>{len(matches)}</record_count>"
+            f"<transactions>{rows}</transactions></result_records></response>"
+        ).encode()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                request = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    request = gzip.decompress(request)
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                body = server.body(request)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/xml")
+                if server.compress and "gzip" in self.headers.get(
+                    "Accept-Encoding", ""
+                ):
+                    body = gzip.compress(body, compresslevel=6)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
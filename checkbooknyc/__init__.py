@@ -1,6 +1,66 @@
-from .contracts import Contracts as Contracts
-from .budget import Budget as Budget
-from .revenue import Revenue as Revenue
-from .spending import Spending as Spending
-from .payroll import Payroll as Payroll
-from .client_all import CheckbookNYC as CheckbookNYC
+from typing import TYPE_CHECKING
+import importlib
+
+# Public names and the modules defining them. Nothing is imported until a name
+# is first used, so ``import checkbooknyc`` stays cheap for short-lived
+# processes; the HTTP stack, pandas and pyarrow load only when needed.
+_EXPORTS = {
+    "Contracts": ".contracts",
+    "Budget": ".budget",
+    "Revenue": ".revenue",
+    "Spending": ".spending",
+    "Payroll": ".payroll",
+    "CheckbookNYC": ".client_all",
+    "AsyncCheckbookNYC": ".client_async",
+    "ResponseCache": ".cache",
+    "Record": ".records",
+    "AdaptivePageSize": ".paging",
+    "PageSize": ".paging",
+    "QueryPlanner": ".planner",
+    "HashJoin": ".join",
+    "Job": ".scheduler",
+    "Scheduler": ".scheduler",
+    "LocalStore": ".store",
+    "Hook": ".metrics",
+    "Metrics": ".metrics",
+    "RateLimiter": ".transport",
+    "RetryPolicy": ".transport",
+}
+
+# The asyncio client needs the optional ``httpx``, so ``import *`` skips it.
+__all__ = [name for name in _EXPORTS if name != "AsyncCheckbookNYC"]
+
+if TYPE_CHECKING:
+    from .contracts import Contracts as Contracts
+    from .budget import Budget as Budget
+    from .revenue import Revenue as Revenue
+    from .spending import Spending as Spending
+    from .payroll import Payroll as Payroll
+    from .client_all import CheckbookNYC as CheckbookNYC
+    from .client_async import AsyncCheckbookNYC as AsyncCheckbookNYC
+    from .cache import ResponseCache as ResponseCache
+    from .records import Record as Record
+    from .paging import AdaptivePageSize as AdaptivePageSize
+    from .paging import PageSize as PageSize
+    from .planner import QueryPlanner as QueryPlanner
+    from .join import HashJoin as HashJoin
+    from .scheduler import Job as Job
+    from .scheduler import Scheduler as Scheduler
+    from .store import LocalStore as LocalStore
+    from .metrics import Hook as Hook
+    from .metrics import Metrics as Metrics
+    from .transport import RateLimiter as RateLimiter
+    from .transport import RetryPolicy as RetryPolicy
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
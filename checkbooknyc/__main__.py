@@ -0,0 +1,76 @@
+from typing import List, Optional
+import argparse
+
+from .paging import MAX_PAGE_SIZE, AdaptivePageSize
+
+
+def _key_value(item: str):
+    key, sep, value = item.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"Expected key=value, got {item!r}.")
+    return key, value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="checkbooknyc")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser(
+        "export", help="Export a query to CSV or Parquet files, resumably."
+    )
+    export_parser.add_argument(
+        "data_type",
+        choices=["payroll", "budget", "contracts", "revenue", "spending"],
+    )
+    export_parser.add_argument("--out", required=True, help="Output directory.")
+    export_parser.add_argument(
+        "--params", nargs="*", type=_key_value, default=[], metavar="KEY=VALUE"
+    )
+    export_parser.add_argument("--columns", nargs="*", default=None)
+    export_parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    export_parser.add_argument(
+        "--status", choices=["active", "pending", "registered"], default="active"
+    )
+    export_parser.add_argument(
+        "--category", choices=["all", "expense", "revenue"], default="all"
+    )
+    export_parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE)
+    export_parser.add_argument(
+        "--adaptive", action="store_true", help="Tune the page size per query."
+    )
+    export_parser.add_argument("--workers", type=int, default=1)
+    export_parser.add_argument("--base-url", default="https://www.checkbooknyc.com/api")
+
+    args = parser.parse_args(argv)
+
+    # Imported only once the arguments are valid, so --help stays instant.
+    from .client_all import CheckbookNYC
+    from .export import export
+
+    client = CheckbookNYC(base_url=args.base_url)
+    checkpoint = export(
+        client,
+        args.data_type,
+        args.out,
+        params=dict(args.params),
+        response_columns=args.columns,
+        format=args.format,
+        status=args.status,
+        category=args.category,
+        page_size=(
+            AdaptivePageSize(
+                initial=min(2_000, args.page_size),
+                min_size=min(100, args.page_size),
+                max_size=args.page_size,
+            )
+            if args.adaptive
+            else args.page_size
+        ),
+        workers=args.workers,
+    )
+    print(f"Exported {checkpoint['records']} records to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,24 +1,280 @@
-from typing import Any, Dict, List, Optional, TypedDict
+from collections import deque
+from datetime import date
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import difflib
+import itertools
+import json
+import multiprocessing
+import time
 from xml.etree import ElementTree as ET
 
 import requests
 from loguru import logger
+from . import frames, paging
+from .aggregate import Aggregates, GroupBy
+from .frames import Columns
+from .lookup import Lookup
+from .cache import ResponseCache
+from .coalesce import SingleFlight
+from .data_params import check_columns, get_params
+from .metrics import Hook, RequestEvent
+from .paging import MAX_PAGE_SIZE, PageSize
+from .records import Record, _to_date, record_type
+from .request import Criteria, Request
+from .store import NATURAL_KEYS, LocalStore
+from .transport import Transport, sent_bytes, wire_bytes
 
+Output = Literal["records", "typed", "pandas", "arrow", "raw"]
 
-class Criteria(TypedDict):
-    name: str
-    type: str
-    value: str
+
+def _keyed_by(
+    data_type: str, key: Optional[Sequence[str]], columns: Sequence[str]
+) -> bool:
+    """
+    Tells whether records projected to ``columns`` carry their natural key
+    (``key`` overrides the data type's default).
+    """
+    key = key if key is not None else NATURAL_KEYS.get(data_type)
+    return bool(key) and all(field in columns for field in key)
+
+
+def _check_page(records: Any) -> None:
+    """
+    Raises when a pager gets something other than a page of results, such as
+    the text of a body that failed to parse, whose length says nothing about
+    the end of the data.
+    """
+    if isinstance(records, (str, bytes)) or not hasattr(records, "__len__"):
+        text = records[:200] if isinstance(records, (str, bytes)) else records
+        raise ValueError(f"Expected a page of records, got: {text!r}")
+
+
+def _is_success(body: bytes) -> bool:
+    # Failed requests still come back as HTTP 200 with a failure status near the
+    # top of the document; those must never be cached.
+    return b"<result>failure</result>" not in body[:4096]
+
+
+class _PullParser:
+    """
+    Incremental parser over a response body. Each ``<transaction>`` element is
+    handed out once its closing tag is read and then detached from the tree, so
+    memory stays flat regardless of the page size. With a ``projection`` only
+    those fields are kept; other fields are dropped from the tree as soon as
+    they have been read.
+    """
+
+    def __init__(self, projection: Optional[Iterable[str]] = None):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._parents: List[ET.Element] = []
+        self.projection = frozenset(projection) if projection else None
+
+    def _elements(self) -> Iterator[ET.Element]:
+        projection = self.projection
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._parents.append(elem)
+                continue
+            self._parents.pop()
+            if (
+                projection is not None
+                and elem.tag not in projection
+                and self._parents
+                and self._parents[-1].tag == "transaction"
+            ):
+                # Events are read after a whole chunk is parsed, so later
+                # siblings may already be attached; remove this one by identity.
+                self._parents[-1].remove(elem)
+            elif elem.tag == "transaction":
+                yield elem
+                elem.clear()
+                if self._parents:
+                    self._parents[-1].remove(elem)
+
+
+class TransactionParser(_PullParser):
+    """
+    Push parser that emits each transaction as a dict.
+    """
+
+    def feed(self, chunk: bytes) -> Iterator[Dict[str, Any]]:
+        self._parser.feed(chunk)
+        return self._transactions()
+
+    def close(self) -> Iterator[Dict[str, Any]]:
+        self._parser.close()
+        return self._transactions()
+
+    def _transactions(self) -> Iterator[Dict[str, Any]]:
+        for elem in self._elements():
+            yield {child.tag: child.text for child in elem}
+
+
+class RecordParser(_PullParser):
+    """
+    Push parser that emits each transaction as a typed ``Record``. The record
+    class is derived from the data type's schema plus the tags of the first
+    transaction.
+    """
+
+    def __init__(self, data_type: str, projection: Optional[Iterable[str]] = None):
+        super().__init__(projection)
+        self.data_type = data_type
+        self._record_type = None
+
+    def feed(self, chunk: bytes) -> Iterator[Record]:
+        self._parser.feed(chunk)
+        return self._records()
+
+    def close(self) -> Iterator[Record]:
+        self._parser.close()
+        return self._records()
+
+    def _records(self) -> Iterator[Record]:
+        for elem in self._elements():
+            if self._record_type is None:
+                self._record_type = record_type(
+                    self.data_type, tuple(child.tag for child in elem)
+                )
+            yield self._record_type.from_element(elem)
+
+
+class ColumnParser(_PullParser):
+    """
+    Push parser that appends each transaction straight into per-column buffers,
+    padding with ``None`` where a transaction lacks a column.
+    """
+
+    def __init__(self, projection: Optional[Iterable[str]] = None):
+        super().__init__(projection)
+        self.columns: Dict[str, List[Optional[str]]] = {}
+        self.rows = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self._parser.feed(chunk)
+        self._collect()
+
+    def close(self) -> Dict[str, List[Optional[str]]]:
+        self._parser.close()
+        self._collect()
+        return self.columns
+
+    def _collect(self) -> None:
+        columns = self.columns
+        for elem in self._elements():
+            for child in elem:
+                column = columns.get(child.tag)
+                if column is None:
+                    column = columns[child.tag] = [None] * self.rows
+                column.append(child.text)
+            self.rows += 1
+            for column in columns.values():
+                if len(column) < self.rows:
+                    column.append(None)
+
+
+def parse_body(body: bytes) -> Tuple[Columns, int]:
+    """
+    Parses a whole response body into a column batch and its row count. Runs in
+    the worker processes of the parse pipeline; a batch pickles each column name
+    once instead of once per record.
+    """
+    parser = ColumnParser()
+    parser.feed(body)
+    return parser.close(), parser.rows
 
 
 class BaseClient:
+    data_type: str
+
     def __init__(
         self,
         session: requests.Session,
         base_url: str = "https://www.checkbooknyc.com/api",
+        cache: Optional[ResponseCache] = None,
+        transport: Optional[Transport] = None,
+        hooks: Sequence[Hook] = (),
+        flights: Optional[SingleFlight] = None,
     ):
         self.base_url = base_url
         self.ses = session
+        self.cache = cache
+        self.transport = transport if transport is not None else Transport(session)
+        self.hooks = list(hooks)
+        self.flights = flights
+
+    def _criteria(
+        self, params: Optional[Dict[str, Union[str, int, float]]]
+    ) -> List[Criteria]:
+        """
+        Validates ``params`` against the filters supported by this data type and
+        converts them to request criteria. A ``range`` filter may be given a
+        ``(start, end)`` pair, either side of which may be ``None``.
+        """
+        if not params:
+            return []
+
+        parameters = get_params(data_type=self.data_type)
+        invalid_keys = [key for key in params if key not in parameters]
+        if invalid_keys:
+            closest_matches = {
+                key: difflib.get_close_matches(
+                    word=key, possibilities=parameters.keys(), n=3, cutoff=0.2
+                )
+                for key in invalid_keys
+            }
+            raise ValueError(
+                f"Invalid parameters: {invalid_keys}. Closest potential matches: {closest_matches}"
+            )
+
+        criteria: List[Criteria] = []
+        for name, value in params.items():
+            if not isinstance(value, (tuple, list)):
+                criteria.append(
+                    {"name": name, "type": parameters[name], "value": str(value)}
+                )
+                continue
+            if parameters[name] != "range":
+                raise ValueError(
+                    f"Parameter {name!r} is not a range filter; pass a single value."
+                )
+            start, end = value
+            criterion: Criteria = {"name": name, "type": "range"}
+            if start is not None:
+                criterion["start"] = str(start)
+            if end is not None:
+                criterion["end"] = str(end)
+            criteria.append(criterion)
+        return criteria
+
+    def _columns(
+        self, response_columns: Optional[Iterable[str]]
+    ) -> Optional[List[str]]:
+        """
+        Drops duplicates from ``response_columns``, keeping the order, and warns
+        about columns missing from the data type's column catalog.
+        """
+        if not response_columns:
+            return None
+
+        columns = list(dict.fromkeys(response_columns))
+        check_columns(self.data_type, columns)
+        return columns
 
     def _base_request(
         self,
@@ -28,40 +284,263 @@ class BaseClient:
         max_records: Optional[int] = None,
         response_columns: Optional[List[str]] = None,
     ) -> str:
-        criteria = criteria or []
-        criteria_xml = "".join(
-            [
-                f"""
-            <criteria>
-                <name>{c["name"]}</name>
-                <type>{c["type"]}</type>
-                <value>{c["value"]}</value>
-            </criteria>
-            """
-                for c in criteria
-            ]
+        return Request.build(
+            data_type, criteria, records_from, max_records, response_columns
+        ).xml
+
+    def _fetch(
+        self,
+        criteria: List[Criteria],
+        records_from: Optional[int],
+        max_records: Optional[int],
+        response_columns: Optional[List[str]],
+        stream: bool = False,
+        output: Output = "records",
+    ):
+        if output not in ("records", "typed", "pandas", "arrow", "raw"):
+            raise ValueError(
+                f"Invalid output: {output!r}. "
+                "Expected 'records', 'typed', 'pandas', 'arrow' or 'raw'."
+            )
+        if stream and output not in ("records", "typed"):
+            raise ValueError(
+                "stream=True is only supported with output='records' or 'typed'."
+            )
+
+        request = Request.build(
+            self.data_type,
+            criteria,
+            records_from,
+            max_records,
+            self._columns(response_columns),
         )
-        return f"""
-        <request>
-            <type_of_data>{data_type}</type_of_data>
-            {f"<records_from>{records_from}</records_from>" if records_from else ""}
-            {f"<max_records>{max_records}</max_records>" if max_records else ""}
-            <search_criteria>{criteria_xml}</search_criteria>
-            <response_columns>
+        xml_body = request.xml
+        projection = request.response_columns or None
+        event = None
+        if self.hooks:
+            event = RequestEvent(
+                self.data_type, len(xml_body), records_from, max_records
+            )
+            self._emit("on_request_start", event)
+
+        if stream:
+            key = request if self.cache is not None else None
+            parser = (
+                RecordParser(self.data_type, projection)
+                if output == "typed"
+                else TransactionParser(projection)
+            )
+            records = self._iter_parse(self._post_stream(xml_body, key, event), parser)
+            return records if event is None else self._observe(records, event)
+        if event is None:
+            return self._load(xml_body, request, output)
+        try:
+            result = self._load(xml_body, request, output, event)
+            if isinstance(result, str):
+                event.error = "Failed to parse response."
+            elif output != "raw":
+                event.records = len(result)
+            return result
+        except Exception as e:
+            event.error = repr(e)
+            raise
+        finally:
+            self._finish(event, time.perf_counter() - event.started)
 
-{"".join(f"                <column>{column}</column>\n" for column in response_columns) if response_columns else ""}
-            </response_columns>
-        </request>
+    def _load(
+        self,
+        xml_body: str,
+        request: Request,
+        output: Output,
+        event: Optional[RequestEvent] = None,
+    ):
+        key = request if self.cache is not None else None
+        projection = request.response_columns or None
+        if self.flights is not None or output in ("records", "raw"):
+            if self.flights is not None:
+                body = self._post_shared(xml_body, request, key, event)
+            else:
+                body = self._post(xml_body, key, event)
+            if output == "raw":
+                return body
+            if output == "records":
+                return self._parse(body.decode("utf-8"), projection)
+            chunks = [body]
+        else:
+            chunks = self._post_stream(xml_body, key, event)
+        if output == "typed":
+            return list(
+                self._iter_parse(chunks, RecordParser(self.data_type, projection))
+            )
+        columns = self._parse_columns(chunks, projection)
+        if output == "arrow":
+            return frames.to_arrow(columns, self.data_type)
+        return frames.to_pandas(columns, self.data_type)
+
+    def _post_shared(
+        self,
+        xml_body: str,
+        request: Request,
+        cache_key: Optional[Request],
+        event: Optional[RequestEvent],
+    ) -> bytes:
         """
+        Posts through the shared ``SingleFlight``, so identical requests in
+        flight at the same time from any domain client are sent only once.
+        """
+        body, shared = self.flights.do(
+            request, lambda: self._post(xml_body, cache_key, event), _is_success
+        )
+        if shared and event is not None:
+            event.shared = True
+            event.response_bytes = len(body)
+        return body
+
+    def _emit(self, method: str, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            try:
+                getattr(hook, method)(event)
+            except Exception:
+                logger.exception(f"Hook {hook!r} failed in {method}.")
+
+    def _finish(self, event: RequestEvent, seconds: float) -> None:
+        event.seconds = seconds
+        event.parse_seconds = max(0.0, seconds - event.network_seconds)
+        self._emit("on_request_end", event)
+
+    def _observe(self, records: Iterator[Any], event: RequestEvent) -> Iterator[Any]:
+        """
+        Passes streamed records through, counting them and the time spent
+        producing them, and ends ``event`` once the stream is exhausted or
+        closed.
+        """
+        busy = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    record = next(records)
+                except StopIteration:
+                    return
+                finally:
+                    busy += time.perf_counter() - start
+                event.records += 1
+                yield record
+        except Exception as e:
+            event.error = repr(e)
+            raise
+        finally:
+            records.close()
+            self._finish(event, busy)
+
+    def _metered(
+        self,
+        chunks: Iterator[bytes],
+        event: Optional[RequestEvent],
+        response: Optional[requests.Response] = None,
+    ) -> Iterator[bytes]:
+        if event is None:
+            yield from chunks
+            return
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            event.network_seconds += time.perf_counter() - start
+            if chunk is None:
+                if response is not None:
+                    event.wire_bytes = wire_bytes(response)
+                return
+            event.response_bytes += len(chunk)
+            yield chunk
+
+    def _send(
+        self, xml_request: str, event: Optional[RequestEvent], stream: bool = False
+    ) -> requests.Response:
+        if event is None:
+            return self.transport.post(self.base_url, xml_request, stream=stream)
+        start = time.perf_counter()
+        try:
+            response = self.transport.post(
+                self.base_url,
+                xml_request,
+                stream=stream,
+                on_retry=lambda: setattr(event, "retries", event.retries + 1),
+            )
+        finally:
+            event.latency = time.perf_counter() - start
+            event.network_seconds += event.latency
+        event.request_wire_bytes = sent_bytes(response)
+        return response
+
+    def _post(
+        self,
+        xml_request: str,
+        cache_key: Optional[Request] = None,
+        event: Optional[RequestEvent] = None,
+    ) -> bytes:
+        if cache_key is not None:
+            start = time.perf_counter()
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if event is not None:
+                    event.cached = True
+                    event.network_seconds += time.perf_counter() - start
+                    event.response_bytes = len(cached)
+                return cached
 
-    def _post(self, xml_request: str) -> bytes:
-        response = self.ses.post(self.base_url, data=xml_request)
+        response = self._send(xml_request, event)
         response.raise_for_status()
+        if event is not None:
+            event.response_bytes = len(response.content)
+            event.wire_bytes = wire_bytes(response)
+        if cache_key is not None and _is_success(response.content):
+            self.cache.put(cache_key, response.content)
         return response.content
 
-    def _parse(self, xml_content: str) -> List[Dict[str, Any]] | str:
+    def _post_stream(
+        self,
+        xml_request: str,
+        cache_key: Optional[Request] = None,
+        event: Optional[RequestEvent] = None,
+        chunk_size: int = 64 * 1024,
+    ) -> Iterator[bytes]:
+        """
+        Posts the request and yields the response body in chunks as it arrives.
+        """
+        if cache_key is not None:
+            cached = self.cache.iter_chunks(cache_key, chunk_size)
+            if cached is not None:
+                if event is not None:
+                    event.cached = True
+                yield from self._metered(cached, event)
+                return
+
+        with self._send(xml_request, event, stream=True) as response:
+            response.raise_for_status()
+            chunks = self._metered(
+                response.iter_content(chunk_size=chunk_size), event, response
+            )
+            if cache_key is None:
+                yield from chunks
+                return
+
+            first = next(chunks, b"")
+            if not _is_success(first):
+                yield first
+                yield from chunks
+                return
+            yield from self.cache.tee(cache_key, itertools.chain([first], chunks))
+
+    def _parse(
+        self, xml_content: str, projection: Optional[Collection[str]] = None
+    ) -> List[Dict[str, Any]] | str:
         try:
             root = ET.fromstring(xml_content)
+            if projection:
+                return [
+                    {child.tag: child.text for child in node if child.tag in projection}
+                    for node in root.findall(".//transaction")
+                ]
             return [
                 {child.tag: child.text for child in node}
                 for node in root.findall(".//transaction")
@@ -70,3 +549,341 @@ class BaseClient:
             logger.error(f"Failed to parse response: {e}")
             logger.error(f"Error: {xml_content}")
             return xml_content
+
+    def _iter_parse(
+        self,
+        chunks: Iterable[bytes],
+        parser: Optional[Union[TransactionParser, RecordParser]] = None,
+    ) -> Iterator[Any]:
+        """
+        Incrementally parses a response body, yielding each transaction as soon as
+        its closing tag is read.
+        """
+        parser = parser or TransactionParser()
+        try:
+            for chunk in chunks:
+                yield from parser.feed(chunk)
+            yield from parser.close()
+        except ET.ParseError as e:
+            logger.error(f"Failed to parse response stream: {e}")
+            raise
+
+    def _parse_columns(
+        self, chunks: Iterable[bytes], projection: Optional[Iterable[str]] = None
+    ) -> Dict[str, List[Optional[str]]]:
+        parser = ColumnParser(projection)
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+            return parser.close()
+        except ET.ParseError as e:
+            logger.error(f"Failed to parse response stream: {e}")
+            raise
+
+    def _write_through(
+        self,
+        pages: Iterable[Any],
+        store: LocalStore,
+        params: Optional[Dict[str, Any]],
+        scope: Sequence[str] = (),
+        complete: bool = True,
+        response_columns: Optional[List[str]] = None,
+    ) -> Iterator[Any]:
+        """
+        Passes ``pages`` through while writing each one into ``store``. Once the
+        last page has been stored the query is marked as covered, unless the
+        pages are not the ``complete`` result (a resumed pager).
+
+        Projected pages hold partial records. They are merged into the stored
+        records by natural key and never mark the query covered; without a
+        natural key among ``response_columns`` they are not stored at all.
+        """
+        merge = bool(response_columns)
+        if merge and not _keyed_by(self.data_type, None, response_columns):
+            logger.warning(
+                f"Projected {self.data_type} pages lack a natural key and are "
+                "not written to the store."
+            )
+            yield from pages
+            return
+
+        for records in pages:
+            if not isinstance(records, list):
+                raise ValueError(
+                    "Writing to a store requires output='records' or 'typed'."
+                )
+            store.upsert(
+                self.data_type,
+                [r.as_dict() if isinstance(r, Record) else r for r in records],
+                scope=scope,
+                merge=merge,
+            )
+            yield records
+        if complete and not merge:
+            store.mark_covered(self.data_type, params, scope)
+
+    def _aggregate(
+        self,
+        pages: Callable[[List[str]], Iterable[List[Dict[str, Any]]]],
+        by: Sequence[str],
+        aggregates: Aggregates,
+    ) -> List[Dict[str, Any]]:
+        """
+        Reduces the pages of a query to one row per ``by`` group. Only the
+        columns the aggregation reads are requested, and each page is dropped
+        once it has been folded in.
+        """
+        group = GroupBy(self.data_type, by, aggregates)
+        for records in pages(group.columns):
+            group.update(records)
+        return group.result()
+
+    def _fetch_many(
+        self,
+        pages: Callable[
+            [Dict[str, Any], Optional[List[str]]], Iterable[List[Dict[str, Any]]]
+        ],
+        key: str,
+        values: Iterable[Any],
+        params: Optional[Dict[str, Any]],
+        response_columns: Optional[List[str]],
+        workers: int,
+        store: Optional[LocalStore],
+        scope: Sequence[str],
+        window: int,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Looks up the records for many ``key`` values. Keys ``store`` covers are
+        answered from it; the rest are grouped into queries by ``Lookup`` and
+        run ``workers`` at a time, each through the response cache and request
+        coalescing like any other fetch.
+        """
+        lookup = Lookup(self.data_type, key, values, window)
+        if response_columns:
+            response_columns = list(dict.fromkeys([key, *response_columns]))
+        missing = []
+        for value in lookup.values:
+            stored = (
+                store.query(self.data_type, {**(params or {}), key: value}, scope)
+                if store is not None
+                else None
+            )
+            if stored is None:
+                missing.append(value)
+            else:
+                lookup.results[value] = stored
+        queries = lookup.queries(params, missing)
+        logger.info(
+            f"Looking up {len(missing)} of {len(lookup.values)} {key} values "
+            f"in {len(queries)} requests."
+        )
+
+        def run(query: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return [
+                record
+                for records in pages(query, response_columns)
+                for record in records
+            ]
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for (_, keys), records in zip(
+                queries, executor.map(run, [query for query, _ in queries])
+            ):
+                lookup.update(keys, records)
+        return lookup.results
+
+    def _sync(
+        self,
+        store: LocalStore,
+        pages: Callable[[Dict[str, Any]], Iterable[List[Dict[str, Any]]]],
+        params: Optional[Dict[str, Any]],
+        watermark: Optional[str],
+        key: Optional[Sequence[str]] = None,
+        scope: Sequence[str] = (),
+        response_columns: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Fetches the records of a query newer than its stored watermark, merges
+        them into ``store`` and advances the watermark to the newest ``watermark``
+        date seen. The watermark only moves once every page has been stored, so
+        an interrupted sync simply repeats; overlap is removed by the store's
+        natural-key dedup. Without a ``watermark`` field the whole query is
+        refetched. A projected sync merges partial records by key and does not
+        mark the query covered.
+        """
+        merge = bool(response_columns)
+        if merge and not _keyed_by(self.data_type, key, response_columns):
+            raise ValueError(
+                f"A projected sync of {self.data_type} needs the natural key "
+                "(or ``key``) among the response columns."
+            )
+        original = params
+        params = dict(params or {})
+        query = [self.data_type, *scope, sorted((k, str(v)) for k, v in params.items())]
+        if merge:
+            # A projected sync has its own watermark, so a later full sync
+            # still fetches the fields it left out.
+            query.append(sorted(response_columns))
+        query = json.dumps(query)
+        since = store.get_watermark(query) if watermark else None
+        if since is not None:
+            if watermark in params:
+                raise ValueError(
+                    f"Cannot sync on {watermark!r} while also filtering on it."
+                )
+            params[watermark] = (since, None)
+            logger.info(f"Syncing {self.data_type} records since {since}.")
+
+        newest = date.fromisoformat(since) if since else None
+        written = 0
+        for records in pages(params):
+            written += store.upsert(self.data_type, records, key, scope, merge)
+            if not watermark:
+                continue
+            for record in records:
+                value = record.get(watermark)
+                value = _to_date(value) if value else None
+                if isinstance(value, date) and (newest is None or value > newest):
+                    newest = value
+
+        if newest is not None:
+            store.set_watermark(query, newest.isoformat())
+        if not merge:
+            store.mark_covered(self.data_type, original, scope)
+        return written
+
+    def _pipeline(
+        self,
+        fetch_body: Callable[[int, int], bytes],
+        page_size: Union[int, PageSize],
+        workers: int,
+        records_from: int,
+        processes: int,
+        output: Output,
+    ) -> Iterator[Any]:
+        # Forking a process that already runs download threads can deadlock.
+        methods = multiprocessing.get_all_start_methods()
+        pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            ),
+        )
+
+        def fetch_page(records_from: int, size: int):
+            body = fetch_body(records_from, size)
+            if not _is_success(body):
+                logger.error(f"Error: {body[:4096].decode('utf-8', 'replace')}")
+            return self._from_columns(*pool.submit(parse_body, body).result(), output)
+
+        try:
+            yield from self._paginate(
+                fetch_page, page_size, max(workers, 2 * processes), records_from
+            )
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _from_columns(
+        self, columns: Columns, rows: int, output: Output
+    ) -> Union[List[Any], Any]:
+        """
+        Converts a column batch from ``parse_body`` to ``output``. Tags missing
+        from a transaction are ``None`` in records.
+        """
+        if output == "pandas":
+            return frames.to_pandas(columns, self.data_type)
+        if output == "arrow":
+            return frames.to_arrow(columns, self.data_type)
+        names = tuple(columns)
+        values = zip(*columns.values()) if names else itertools.repeat((), rows)
+        if output == "typed":
+            cls = record_type(self.data_type, names)
+            return [cls.from_row(names, row) for row in values]
+        return [dict(zip(names, row)) for row in values]
+
+    def _paginate(
+        self,
+        fetch_page: Callable[[int, int], List[Dict[str, Any]]],
+        page_size: Union[int, PageSize] = MAX_PAGE_SIZE,
+        workers: int = 1,
+        records_from: int = 1,
+        processes: int = 0,
+        output: Output = "records",
+        prefetch: int = 0,
+        prefetch_bytes: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields successive pages from ``fetch_page(records_from, max_records)`` in
+        order until a page shorter than its requested size marks the end of the
+        data. ``page_size`` is a fixed size or a ``PageSize`` policy, which sees
+        the latency of every page. With ``workers > 1`` that many
+        ``records_from`` windows are kept in flight at once. Paging starts at
+        ``records_from``, which lets an interrupted run resume.
+
+        With ``processes > 0`` ``fetch_page`` must return raw response bodies,
+        which are parsed into column batches by a pool of that many processes
+        and converted to ``output`` here. At least two downloads per process are
+        kept in flight so the parsers never wait on the network.
+
+        With ``prefetch > 0`` up to that many finished pages are read ahead in
+        the background while the consumer works on the current one, holding at
+        most about ``prefetch_bytes`` of them; a consumer that falls behind
+        pauses the downloads.
+        """
+        if prefetch > 0:
+            yield from paging.prefetch(
+                self._paginate(
+                    fetch_page, page_size, workers, records_from, processes, output
+                ),
+                prefetch,
+                prefetch_bytes,
+            )
+            return
+
+        if processes > 0:
+            yield from self._pipeline(
+                fetch_page, page_size, workers, records_from, processes, output
+            )
+            return
+
+        policy = page_size if isinstance(page_size, PageSize) else PageSize(page_size)
+
+        def fetch_window(records_from: int, size: int):
+            start = time.perf_counter()
+            records = fetch_page(records_from, size)
+            return records, size, time.perf_counter() - start
+
+        if workers <= 1:
+            while True:
+                records, size, seconds = fetch_window(records_from, policy.next())
+                _check_page(records)
+                policy.record(size, len(records), seconds)
+
+                yield records
+
+                if len(records) < size:
+                    logger.info("All records fetched.")
+                    return
+
+                records_from += size
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending: Deque[Future] = deque()
+        try:
+            while True:
+                while len(pending) < workers:
+                    size = policy.next()
+                    pending.append(executor.submit(fetch_window, records_from, size))
+                    records_from += size
+
+                records, size, seconds = pending.popleft().result()
+                _check_page(records)
+                policy.record(size, len(records), seconds)
+
+                yield records
+
+                if len(records) < size:
+                    logger.info("All records fetched.")
+                    return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
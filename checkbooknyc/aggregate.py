@@ -0,0 +1,115 @@
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+
+from .data_params import check_columns
+from .records import Record, _to_decimal, converter
+
+AGGREGATES = ("sum", "count", "min", "max", "mean")
+
+Aggregates = Mapping[str, Union[str, Sequence[str]]]
+
+
+class GroupBy:
+    """
+    Streaming group-by over pages of records. ``aggregates`` maps a column to
+    one or more of ``sum``, ``count``, ``min``, ``max`` and ``mean``; the column
+    ``"*"`` with ``count`` counts rows. Each page updates one accumulator per
+    group and aggregated column and can then be discarded, so memory grows with
+    the number of groups rather than rows.
+
+    Values are converted as in typed records: amounts to ``Decimal`` and dates
+    to ``date``. Values that do not convert, and missing values, are skipped.
+    The accumulators are updated row by row rather than through a pandas
+    ``groupby``: DataFrame pages hold amounts as float64, which would lose the
+    exact ``Decimal`` sums, and a column with one unconvertible value stays text
+    there instead of skipping just that value.
+    """
+
+    def __init__(self, data_type: str, by: Sequence[str], aggregates: Aggregates):
+        self.data_type = data_type
+        self.by = tuple(by)
+        self.aggregates: Dict[str, Tuple[str, ...]] = {
+            column: (funcs,) if isinstance(funcs, str) else tuple(funcs)
+            for column, funcs in aggregates.items()
+        }
+        if not self.aggregates:
+            raise ValueError("At least one aggregate is required.")
+
+        check_columns(data_type, [c for c in (*self.by, *self.aggregates) if c != "*"])
+        for column, funcs in self.aggregates.items():
+            invalid_funcs = [f for f in funcs if f not in AGGREGATES]
+            if invalid_funcs or not funcs:
+                raise ValueError(
+                    f"Invalid aggregates for {column!r}: {invalid_funcs}. "
+                    f"Expected any of {list(AGGREGATES)}."
+                )
+            if column == "*" and set(funcs) != {"count"}:
+                raise ValueError("Only 'count' applies to '*'.")
+            if column.endswith("_date") and {"sum", "mean"} & set(funcs):
+                raise ValueError(f"Cannot sum or average the dates in {column!r}.")
+
+        self._specs = []
+        for column, funcs in self.aggregates.items():
+            convert = converter(data_type, column)
+            if convert is None and {"sum", "mean"} & set(funcs):
+                convert = _to_decimal
+            self._specs.append((column, convert))
+        self.groups: Dict[Tuple[Any, ...], List[List[Any]]] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        The response columns the aggregation reads.
+        """
+        return list(dict.fromkeys(c for c in (*self.by, *self.aggregates) if c != "*"))
+
+    def update(self, records: Iterable[Union[Mapping[str, Any], Record]]) -> None:
+        by, specs, groups = self.by, self._specs, self.groups
+        for record in records:
+            if isinstance(record, Record):
+                record = record.as_dict()
+            key = tuple(record.get(column) for column in by)
+            state = groups.get(key)
+            if state is None:
+                # count, sum, min, max per aggregated column
+                state = groups[key] = [[0, 0, None, None] for _ in specs]
+            for acc, (column, convert) in zip(state, specs):
+                if column == "*":
+                    acc[0] += 1
+                    continue
+                value = record.get(column)
+                if value is None:
+                    continue
+                if convert is not None and isinstance(value, str):
+                    value = convert(value)
+                    if isinstance(value, str):
+                        continue
+                acc[0] += 1
+                if isinstance(value, (int, float, Decimal)):
+                    acc[1] += value
+                if acc[2] is None or value < acc[2]:
+                    acc[2] = value
+                if acc[3] is None or value > acc[3]:
+                    acc[3] = value
+
+    def result(self) -> List[Dict[str, Any]]:
+        """
+        Returns one row per group, in the order the groups were first seen.
+        Aggregates are named ``<column>_<func>``, or ``count`` for ``"*"``.
+        """
+        rows = []
+        for key, state in self.groups.items():
+            row = dict(zip(self.by, key))
+            for acc, (column, _) in zip(state, self._specs):
+                count, total, low, high = acc
+                for func in self.aggregates[column]:
+                    name = "count" if column == "*" else f"{column}_{func}"
+                    row[name] = {
+                        "count": count,
+                        "sum": total if count else None,
+                        "min": low,
+                        "max": high,
+                        "mean": total / count if count else None,
+                    }[func]
+            rows.append(row)
+        return rows
@@ -1,20 +1,13 @@
-from typing import Dict, List, Optional, Union
-import difflib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 
-import requests
-from loguru import logger
-from ._base import BaseClient, Criteria
-from .data_params import get_params
+from ._base import BaseClient, Criteria, Output
+from .aggregate import Aggregates
+from .paging import MAX_PAGE_SIZE, PageSize
+from .store import LocalStore
 
 
 class Budget(BaseClient):
-    def __init__(
-        self,
-        session: requests.Session,
-        base_url: str = "https://www.checkbooknyc.com/api",
-    ):
-        super().__init__(session, base_url)
-        self.data_type = "Budget"
+    data_type = "Budget"
 
     def fetch(
         self,
@@ -22,56 +15,139 @@ class Budget(BaseClient):
         max_records: Optional[int],
         response_columns: Optional[List[str]] = None,
         params: Optional[Dict[str, Union[str, int, float]]] = None,
+        stream: bool = False,
+        output: Output = "records",
     ) -> str:
         """
         Builds a string XML request for the budget endpoint using supported filters.
+        With ``stream=True`` a generator of records is returned that parses the
+        response incrementally while it downloads. ``output="typed"`` returns
+        compact ``Record`` objects with converted values, and ``output="pandas"``
+        or ``output="arrow"`` a typed DataFrame or Arrow table.
         """
 
-        criteria: List[Criteria] = []
-
-        if params:
-            parameters = get_params(data_type="Budget")
-            invalid_keys = list(filter(lambda k: k not in parameters, params.keys()))
-            if invalid_keys:
-                closest_matches = {
-                    key: difflib.get_close_matches(
-                        word=key, possibilities=parameters.keys(), n=3, cutoff=0.2
-                    )
-                    for key in invalid_keys
-                }
-                raise ValueError(
-                    f"Invalid parameters: {invalid_keys}. Closest potential matches: {closest_matches}"
-                )
-            criteria.extend(
-                map(
-                    lambda item: {
-                        "name": item[0],
-                        "type": parameters[item[0]],
-                        "value": str(item[1]),
-                    },
-                    params.items(),
-                )
-            )
+        criteria: List[Criteria] = self._criteria(params)
 
-        xml_body = self._base_request(
-            self.data_type, criteria, records_from, max_records, response_columns
+        return self._fetch(
+            criteria, records_from, max_records, response_columns, stream, output
         )
-        return self._parse(self._post(xml_body).decode("utf-8"))
 
     def fetch_all(
         self,
         response_columns: Optional[List[str]] = None,
         params: Optional[Dict[str, Union[str, int, float]]] = None,
+        workers: int = 1,
+        output: Output = "records",
+        page_size: Union[int, PageSize] = MAX_PAGE_SIZE,
+        records_from: int = 1,
+        store: Optional[LocalStore] = None,
+        processes: int = 0,
+        prefetch: int = 0,
+        prefetch_bytes: Optional[int] = None,
     ):
-        records_from = 1
-        max_records = 20_000
-        while True:
-            records = self.fetch(records_from, max_records, response_columns, params)
+        """
+        Yields every page of results in order. ``workers`` sets how many pages are
+        requested concurrently over the shared session; ``output`` is passed to
+        ``fetch``. ``page_size`` is a fixed size or a policy such as
+        ``AdaptivePageSize``. Paging starts at ``records_from``. Pages are also
+        written into ``store`` when one is given. With ``processes`` the pages
+        are parsed in that many worker processes while downloads continue.
+        With ``prefetch`` up to that many pages are downloaded ahead of the
+        consumer, holding at most about ``prefetch_bytes`` of them.
+        """
+        pages = self._paginate(
+            lambda records_from, max_records: self.fetch(
+                records_from,
+                max_records,
+                response_columns,
+                params,
+                output="raw" if processes else output,
+            ),
+            page_size=page_size,
+            workers=workers,
+            records_from=records_from,
+            processes=processes,
+            output=output,
+            prefetch=prefetch,
+            prefetch_bytes=prefetch_bytes,
+        )
+        if store is not None:
+            pages = self._write_through(
+                pages, store, params, (), records_from == 1, response_columns
+            )
+        yield from pages
 
-            yield records
+    def sync(
+        self,
+        store: LocalStore,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        response_columns: Optional[List[str]] = None,
+        key: Optional[Sequence[str]] = None,
+        workers: int = 1,
+    ) -> int:
+        """
+        Refetches the query and merges it into ``store``, deduplicated by natural
+        key (``key`` overrides the default). Budget has no date filter to use as
+        a watermark. Returns the number of records written.
+        """
+        return self._sync(
+            store,
+            lambda params: self.fetch_all(response_columns, params, workers=workers),
+            params,
+            watermark=None,
+            key=key,
+            response_columns=response_columns,
+        )
 
-            if not records or len(records) < 20_000:
-                logger.info("All records fetched.")
-                break
+    def aggregate(
+        self,
+        by: Sequence[str],
+        aggregates: Aggregates,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        workers: int = 1,
+        page_size: Union[int, PageSize] = MAX_PAGE_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """
+        Streams every page of the query into a group-by, for example summed
+        ``adopted`` per ``agency_code``, and returns one row per group.
+        ``aggregates`` maps columns to ``sum``, ``count``, ``min``, ``max`` or
+        ``mean``. Only the grouped and aggregated columns are fetched and no
+        page is kept after it has been counted.
+        """
+        return self._aggregate(
+            lambda columns: self.fetch_all(
+                columns, params, workers=workers, page_size=page_size
+            ),
+            by,
+            aggregates,
+        )
 
-            records_from += 20_000
+    def fetch_many(
+        self,
+        key: str,
+        values: Iterable[Union[str, int, float]],
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        workers: int = 8,
+        store: Optional[LocalStore] = None,
+        window: int = 100,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Looks up the records for many values of the filter ``key``, such as
+        ``budget_code``, and returns them by key value (as text) in the order
+        given. Duplicate values are looked up once, values ``store`` covers are
+        read from it, and the rest are fetched ``workers`` requests at a time
+        with ``params`` as shared filters. A ``range`` key is looked up
+        ``window`` sorted values per request.
+        """
+        return self._fetch_many(
+            lambda params, columns: self.fetch_all(columns, params),
+            key,
+            values,
+            params,
+            response_columns,
+            workers,
+            store,
+            (),
+            window,
+        )
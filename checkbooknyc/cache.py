@@ -0,0 +1,235 @@
+from datetime import date
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+
+from .request import Criterion, Request
+
+TTL = Union[
+    None,
+    float,
+    Dict[str, Optional[float]],
+    Callable[[str, Tuple[Criterion, ...]], Optional[float]],
+]
+
+
+def keep_closed_years(ttl: Optional[float]) -> Callable[..., Optional[float]]:
+    """
+    TTL policy that keeps responses for closed fiscal years forever and expires
+    everything else after ``ttl`` seconds. NYC fiscal years end on June 30.
+    """
+    today = date.today()
+    current_year = today.year + 1 if today.month >= 7 else today.year
+    year_fields = {"fiscal_year", "year", "budget_fiscal_year", "calendar_year"}
+
+    def policy(data_type: str, criteria: Tuple[Criterion, ...]):
+        years = [
+            int(value)
+            for name, _, value, *_ in criteria
+            if name in year_fields and value is not None
+        ]
+        if years and max(years) < current_year:
+            return None
+        return ttl
+
+    return policy
+
+
+class ResponseCache:
+    """
+    Persistent cache of compressed response bodies on local disk.
+
+    Entries expire according to ``ttl``, which is either a number of seconds, a
+    mapping of data type to seconds, or a callable receiving the data type and
+    canonical criteria; ``None`` means an entry never expires. Once the stored
+    bytes exceed ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = 1024**3,
+        ttl: TTL = None,
+        compresslevel: int = 6,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.compresslevel = compresslevel
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.directory / "index.sqlite", check_same_thread=False
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                digest TEXT PRIMARY KEY,
+                data_type TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.z"
+
+    def _expiry(self, key: Request) -> Optional[float]:
+        if callable(self.ttl):
+            ttl = self.ttl(key.data_type, key.criteria)
+        elif isinstance(self.ttl, dict):
+            ttl = self.ttl.get(key.data_type)
+        else:
+            ttl = self.ttl
+        return None if ttl is None else time.time() + ttl
+
+    def _lookup(self, key: Request) -> Optional[BinaryIO]:
+        """
+        Opens the entry for ``key`` while holding the lock, so an eviction on
+        another thread cannot unlink it between the lookup and the read; an open
+        file stays readable after it is unlinked.
+        """
+        digest = key.digest
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires FROM entries WHERE digest = ?", (digest,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if row[0] is not None and row[0] < time.time():
+                self._delete(digest)
+                self._db.commit()
+                self.misses += 1
+                return None
+            try:
+                f = open(self._path(digest), "rb")
+            except FileNotFoundError:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE entries SET last_used = ? WHERE digest = ?",
+                (time.time(), digest),
+            )
+            self._db.commit()
+            self.hits += 1
+            return f
+
+    def get(self, key: Request) -> Optional[bytes]:
+        f = self._lookup(key)
+        if f is None:
+            return None
+        with f:
+            return zlib.decompress(f.read())
+
+    def iter_chunks(
+        self, key: Request, chunk_size: int = 64 * 1024
+    ) -> Optional[Iterator[bytes]]:
+        """
+        Returns an iterator that decompresses a cached body incrementally, or
+        ``None`` on a miss.
+        """
+        f = self._lookup(key)
+        if f is None:
+            return None
+
+        def chunks() -> Iterator[bytes]:
+            decompressor = zlib.decompressobj()
+            with f:
+                while block := f.read(chunk_size):
+                    yield decompressor.decompress(block)
+            yield decompressor.flush()
+
+        return chunks()
+
+    def put(self, key: Request, body: bytes) -> None:
+        for _ in self._write(key, [body]):
+            pass
+
+    def tee(self, key: Request, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Passes ``chunks`` through while compressing them to disk. The entry is
+        only published if the stream is consumed to the end.
+        """
+        return self._write(key, chunks)
+
+    def _write(self, key: Request, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        digest = key.digest
+        tmp = self.directory / f"{digest}.{uuid.uuid4().hex}.tmp"
+        compressor = zlib.compressobj(self.compresslevel)
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in chunks:
+                    f.write(compressor.compress(chunk))
+                    yield chunk
+                f.write(compressor.flush())
+            size = tmp.stat().st_size
+            os.replace(tmp, self._path(digest))
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (digest, key.data_type, size, self._expiry(key), time.time()),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _delete(self, digest: str) -> None:
+        self._path(digest).unlink(missing_ok=True)
+        self._db.execute("DELETE FROM entries WHERE digest = ?", (digest,))
+
+    def _evict(self) -> None:
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for digest, size in self._db.execute(
+            "SELECT digest, size FROM entries ORDER BY last_used"
+        ).fetchall():
+            self._delete(digest)
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock:
+            for (digest,) in self._db.execute("SELECT digest FROM entries").fetchall():
+                self._delete(digest)
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
@@ -1,10 +1,29 @@
-from typing import Optional
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+)
 import requests
+from requests.adapters import HTTPAdapter
+from ._base import BaseClient
+from .cache import ResponseCache
+from .coalesce import SingleFlight
+from .metrics import Hook
 from .payroll import Payroll
 from .budget import Budget
 from .contracts import Contracts
 from .revenue import Revenue
 from .spending import Spending
+from .transport import RateLimiter, RetryPolicy, Timeout, Transport
+
+if TYPE_CHECKING:
+    from .scheduler import Job, JobResult
 
 
 class CheckbookNYC:
@@ -12,13 +31,119 @@ class CheckbookNYC:
         self,
         base_url: str = "https://www.checkbooknyc.com/api",
         session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+        timeout: Timeout = (10.0, 300.0),
+        retry: Optional[RetryPolicy] = None,
+        rate_limit: Optional[float] = None,
+        pool_size: int = 10,
+        hooks: Sequence[Hook] = (),
+        coalesce: bool = False,
+        memo_ttl: float = 0.0,
+        compress_requests: Optional[int] = None,
+        accept_encoding: Optional[Sequence[str]] = None,
     ):
+        """
+        ``timeout`` is a ``(connect, read)`` pair in seconds, ``retry`` controls
+        backoff on transient failures and ``rate_limit`` caps requests per second
+        across all domain clients. ``pool_size`` sizes the connection pool of the
+        session created here; a session passed in is used as configured.
+        ``hooks`` receive an event at the start and end of every request, for
+        example a ``Metrics`` collecting counters and histograms.
+
+        With ``coalesce`` identical requests made at the same time by any domain
+        client are sent once and their response shared; ``memo_ttl`` also keeps
+        successful responses for that many seconds to serve bursts. Streamed
+        fetches are never coalesced. Request bodies of at least
+        ``compress_requests`` bytes are sent gzip-compressed, and
+        ``accept_encoding`` lists the response encodings to ask for, most
+        preferred first.
+        """
         if session is None:
             session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
         self.session = session
         self.base_url = base_url
-        self.payroll = Payroll(self.session, self.base_url)
-        self.budget = Budget(self.session, self.base_url)
-        self.contracts = Contracts(self.session, self.base_url)
-        self.revenue = Revenue(self.session, self.base_url)
-        self.spending = Spending(self.session, self.base_url)
+        self.cache = cache
+        self.transport = Transport(
+            session,
+            timeout=timeout,
+            retry=retry,
+            rate_limiter=RateLimiter(rate_limit) if rate_limit else None,
+            compress_requests=compress_requests,
+            accept_encoding=accept_encoding,
+        )
+        self.flights = SingleFlight(memo_ttl) if coalesce or memo_ttl > 0 else None
+        self.payroll = Payroll(
+            self.session, self.base_url, self.cache, self.transport, hooks, self.flights
+        )
+        self.budget = Budget(
+            self.session, self.base_url, self.cache, self.transport, hooks, self.flights
+        )
+        self.contracts = Contracts(
+            self.session, self.base_url, self.cache, self.transport, hooks, self.flights
+        )
+        self.revenue = Revenue(
+            self.session, self.base_url, self.cache, self.transport, hooks, self.flights
+        )
+        self.spending = Spending(
+            self.session, self.base_url, self.cache, self.transport, hooks, self.flights
+        )
+
+    def endpoint(self, data_type: str) -> BaseClient:
+        """
+        Returns the domain client for ``data_type`` (for example "Spending").
+        """
+        for client in (
+            self.payroll,
+            self.budget,
+            self.contracts,
+            self.revenue,
+            self.spending,
+        ):
+            if client.data_type.lower() == data_type.lower():
+                return client
+        raise ValueError(
+            f"Invalid data type: {data_type}. Expected one of "
+            "['Payroll', 'Budget', 'Contracts', 'Revenue', 'Spending']."
+        )
+
+    def pages(
+        self,
+        data_type: str,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        response_columns: Optional[List[str]] = None,
+        status: Literal["active", "pending", "registered"] = "active",
+        category: Literal["all", "expense", "revenue"] = "all",
+        **paging,
+    ) -> Iterator:
+        """
+        Pages through any data type with one signature. ``status`` and
+        ``category`` only apply to Contracts; ``paging`` is passed on to the
+        domain client's pager.
+        """
+        client = self.endpoint(data_type)
+        if isinstance(client, Contracts):
+            return client.fetch_all(
+                status, category, response_columns, params, **paging
+            )
+        if isinstance(client, Budget):
+            return client.fetch_all(response_columns, params, **paging)
+        return client.fetch_all_records(response_columns, params, **paging)
+
+    def run(
+        self,
+        jobs: Iterable["Job"],
+        concurrency: int = 5,
+        per_endpoint: Optional[Dict[str, int]] = None,
+    ) -> Iterator["JobResult"]:
+        """
+        Runs ``jobs`` across the endpoints concurrently, at most ``concurrency``
+        at a time and ``per_endpoint`` per data type, and yields each result as
+        its job finishes. Small queries (``Job.max_records``) start before bulk
+        pulls.
+        """
+        from .scheduler import Scheduler
+
+        return Scheduler(self, concurrency, per_endpoint).run(jobs)
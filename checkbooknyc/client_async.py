@@ -0,0 +1,333 @@
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Union,
+)
+from xml.etree import ElementTree as ET
+import asyncio
+
+import httpx
+from loguru import logger
+from ._base import BaseClient, Criteria, TransactionParser, _check_page
+from .paging import MAX_PAGE_SIZE
+from .transport import Timeout
+
+
+class AsyncBaseClient(BaseClient):
+    """
+    Asyncio counterpart of ``BaseClient``. Request building, validation and
+    parsing are shared with the blocking clients; only the transport and the
+    paging loop are asynchronous.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        base_url: str = "https://www.checkbooknyc.com/api",
+    ):
+        super().__init__(client, base_url)
+
+    async def _post(self, xml_request: str) -> bytes:
+        response = await self.ses.post(self.base_url, content=xml_request)
+        response.raise_for_status()
+        return response.content
+
+    async def _post_stream(self, xml_request: str) -> AsyncIterator[bytes]:
+        async with self.ses.stream(
+            "POST", self.base_url, content=xml_request
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                yield chunk
+
+    async def _iter_parse(
+        self, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        parser = TransactionParser()
+        try:
+            async for chunk in chunks:
+                for record in parser.feed(chunk):
+                    yield record
+            for record in parser.close():
+                yield record
+        except ET.ParseError as e:
+            logger.error(f"Failed to parse response stream: {e}")
+            raise
+
+    async def _fetch(
+        self,
+        criteria: List[Criteria],
+        records_from: Optional[int],
+        max_records: Optional[int],
+        response_columns: Optional[List[str]],
+        stream: bool,
+    ):
+        xml_body = self._base_request(
+            self.data_type,
+            criteria,
+            records_from,
+            max_records,
+            self._columns(response_columns),
+        )
+        if stream:
+            return self._iter_parse(self._post_stream(xml_body))
+        return self._parse((await self._post(xml_body)).decode("utf-8"))
+
+    async def _paginate(
+        self,
+        fetch_page: Callable[[int, int], Awaitable[List[Dict[str, Any]]]],
+        max_records: int = MAX_PAGE_SIZE,
+        workers: int = 1,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yields pages in order, keeping up to ``workers`` ``records_from`` windows
+        in flight as tasks on the running event loop.
+        """
+        pending: Deque[asyncio.Future] = deque()
+        records_from = 1
+        try:
+            while True:
+                while len(pending) < max(workers, 1):
+                    pending.append(
+                        asyncio.ensure_future(fetch_page(records_from, max_records))
+                    )
+                    records_from += max_records
+
+                records = await pending.popleft()
+                _check_page(records)
+
+                yield records
+
+                if not records or len(records) < max_records:
+                    logger.info("All records fetched.")
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+class AsyncBudget(AsyncBaseClient):
+    data_type = "Budget"
+
+    async def fetch(
+        self,
+        records_from: Optional[int],
+        max_records: Optional[int],
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        stream: bool = False,
+    ):
+        criteria: List[Criteria] = self._criteria(params)
+        return await self._fetch(
+            criteria, records_from, max_records, response_columns, stream
+        )
+
+    async def fetch_all(
+        self,
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        workers: int = 1,
+    ):
+        async for records in self._paginate(
+            lambda records_from, max_records: self.fetch(
+                records_from, max_records, response_columns, params
+            ),
+            workers=workers,
+        ):
+            yield records
+
+
+class AsyncContracts(AsyncBaseClient):
+    data_type = "Contracts"
+
+    async def fetch(
+        self,
+        status: Literal["active", "pending", "registered"],
+        category: Literal["all", "expense", "revenue"],
+        records_from: Optional[int] = None,
+        max_records: Optional[int] = None,
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        stream: bool = False,
+    ):
+        criteria: List[Criteria] = [
+            {
+                "name": "status",
+                "type": "value",
+                "value": status,
+            },
+            {
+                "name": "category",
+                "type": "value",
+                "value": category,
+            },
+        ]
+
+        criteria.extend(self._criteria(params))
+
+        return await self._fetch(
+            criteria, records_from, max_records, response_columns, stream
+        )
+
+    async def fetch_all(
+        self,
+        status: Literal["active", "pending", "registered"],
+        category: Literal["all", "expense", "revenue"],
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        workers: int = 1,
+    ):
+        async for records in self._paginate(
+            lambda records_from, max_records: self.fetch(
+                status, category, records_from, max_records, response_columns, params
+            ),
+            workers=workers,
+        ):
+            yield records
+
+
+class AsyncPayroll(AsyncBaseClient):
+    data_type = "Payroll"
+
+    async def fetch(
+        self,
+        records_from: Optional[int],
+        max_records: Optional[int],
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        stream: bool = False,
+    ):
+        criteria: List[Criteria] = self._criteria(params)
+        return await self._fetch(
+            criteria, records_from, max_records, response_columns, stream
+        )
+
+    async def fetch_all_records(
+        self,
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        workers: int = 1,
+    ):
+        async for records in self._paginate(
+            lambda records_from, max_records: self.fetch(
+                records_from, max_records, response_columns, params
+            ),
+            workers=workers,
+        ):
+            yield records
+
+
+class AsyncRevenue(AsyncBaseClient):
+    data_type = "Revenue"
+
+    async def fetch(
+        self,
+        records_from: Optional[int],
+        max_records: Optional[int],
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        stream: bool = False,
+    ):
+        criteria: List[Criteria] = self._criteria(params)
+        return await self._fetch(
+            criteria, records_from, max_records, response_columns, stream
+        )
+
+    async def fetch_all_records(
+        self,
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        workers: int = 1,
+    ):
+        async for records in self._paginate(
+            lambda records_from, max_records: self.fetch(
+                records_from, max_records, response_columns, params
+            ),
+            workers=workers,
+        ):
+            yield records
+
+
+class AsyncSpending(AsyncBaseClient):
+    data_type = "Spending"
+
+    async def fetch(
+        self,
+        records_from: Optional[int],
+        max_records: Optional[int],
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        stream: bool = False,
+    ):
+        criteria: List[Criteria] = self._criteria(params)
+        return await self._fetch(
+            criteria, records_from, max_records, response_columns, stream
+        )
+
+    async def fetch_all_records(
+        self,
+        response_columns: Optional[List[str]] = None,
+        params: Optional[Dict[str, Union[str, int, float]]] = None,
+        workers: int = 1,
+    ):
+        async for records in self._paginate(
+            lambda records_from, max_records: self.fetch(
+                records_from, max_records, response_columns, params
+            ),
+            workers=workers,
+        ):
+            yield records
+
+
+class AsyncCheckbookNYC:
+    """
+    Asyncio client with the same layout as ``CheckbookNYC``. All domain clients
+    share one pooled ``httpx.AsyncClient``; use it as an async context manager or
+    call ``aclose`` when done.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://www.checkbooknyc.com/api",
+        client: Optional[httpx.AsyncClient] = None,
+        max_connections: int = 20,
+        timeout: Timeout = (10.0, 300.0),
+    ):
+        """
+        ``timeout`` is a ``(connect, read)`` pair in seconds, as for
+        ``CheckbookNYC``, or one value for both; it applies to the client
+        created here, while a client passed in is used as configured.
+        """
+        if client is None:
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout,) * 2
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read, connect=connect),
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+            )
+        self.client = client
+        self.base_url = base_url
+        self.payroll = AsyncPayroll(self.client, self.base_url)
+        self.budget = AsyncBudget(self.client, self.base_url)
+        self.contracts = AsyncContracts(self.client, self.base_url)
+        self.revenue = AsyncRevenue(self.client, self.base_url)
+        self.spending = AsyncSpending(self.client, self.base_url)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
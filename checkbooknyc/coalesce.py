@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Tuple
+import threading
+import time
+
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls into one. While a call for a key is in
+    flight, later calls for the same key wait for its result (or exception)
+    instead of running their own. Successful results may also be memoized for
+    ``memo_ttl`` seconds, keeping at most ``memo_size`` of them, to serve bursts
+    that arrive just after a call finished.
+    """
+
+    def __init__(self, memo_ttl: float = 0.0, memo_size: int = 128):
+        self.memo_ttl = memo_ttl
+        self.memo_size = memo_size
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._memo: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], bytes],
+        memoize: Callable[[bytes], bool] = lambda value: True,
+    ) -> Tuple[bytes, bool]:
+        """
+        Returns ``fn()`` for ``key`` and whether the result was shared with
+        another caller. Only results for which ``memoize`` is true are kept in
+        the memo.
+        """
+        with self._lock:
+            memo = self._memo.get(key)
+            if memo is not None:
+                if memo[0] > time.monotonic():
+                    return memo[1], True
+                del self._memo[key]
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result(), True
+
+        try:
+            value = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if self.memo_ttl > 0 and future.exception() is None and memoize(value):
+                    self._memo[key] = (time.monotonic() + self.memo_ttl, value)
+                    while len(self._memo) > self.memo_size:
+                        self._memo.popitem(last=False)
+        return value, False
@@ -1,7 +1,15 @@
-def get_params(data_type: str):
-    match data_type:
-        case "Contracts":
-            return {
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Tuple
+import difflib
+
+from loguru import logger
+
+# Filters accepted by each data type, mapped to their criteria type. Built once
+# at import and shared read-only by every client.
+PARAMS: Mapping[str, Mapping[str, str]] = MappingProxyType(
+    {
+        "Contracts": MappingProxyType(
+            {
                 "fiscal_year": "value",
                 "prime_vendor": "value",
                 "vendor_code": "value",
@@ -28,8 +36,9 @@ def get_params(data_type: str):
                 "conditional_category": "value",
                 "contract_class": "value",
             }
-        case "Budget":
-            return {
+        ),
+        "Budget": MappingProxyType(
+            {
                 "year": "value",
                 "budget_code": "value",
                 "budget_code_name": "value",
@@ -53,8 +62,9 @@ def get_params(data_type: str):
                 "committed": "range",
                 "actual_amount": "range",
             }
-        case "Payroll":
-            return {
+        ),
+        "Payroll": MappingProxyType(
+            {
                 "fiscal_year": "value",
                 "calendar_year": "value",
                 "agency_code": "value",
@@ -69,8 +79,9 @@ def get_params(data_type: str):
                 "overtime_payments": "range",
                 "gross_pay_ytd": "range",
             }
-        case "Revenue":
-            return {
+        ),
+        "Revenue": MappingProxyType(
+            {
                 "budget_fiscal_year": "value",
                 "fiscal_year": "value",
                 "agency_code": "value",
@@ -92,8 +103,9 @@ def get_params(data_type: str):
                 "program": "value",
                 "project": "value",
             }
-        case "Spending":
-            return {
+        ),
+        "Spending": MappingProxyType(
+            {
                 "fiscal_year": "value",
                 "payee_name": "value",
                 "payee_code": "value",
@@ -119,3 +131,42 @@ def get_params(data_type: str):
                 "amount_spent": "value",
                 "conditional_category": "value",
             }
+        ),
+    }
+)
+
+
+def get_params(data_type: str) -> Optional[Mapping[str, str]]:
+    return PARAMS.get(data_type)
+
+
+# Columns known for each data type, for spotting typos in column names. Built
+# from the filter schema above, so it is not exhaustive: the API returns tags it
+# cannot filter on (such as ``agency``), and names outside it are only warned
+# about. Add any response-only columns here.
+COLUMNS: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+    {data_type: tuple(params) for data_type, params in PARAMS.items()}
+)
+
+
+def get_columns(data_type: str) -> Tuple[str, ...]:
+    return COLUMNS.get(data_type, ())
+
+
+def check_columns(data_type: str, columns: Iterable[str]) -> None:
+    """
+    Logs a warning with the closest known names for any of ``columns`` missing
+    from the data type's catalog. The columns are still used.
+    """
+    catalog = get_columns(data_type)
+    unknown_columns = [column for column in columns if column not in catalog]
+    if unknown_columns:
+        closest_matches = {
+            column: difflib.get_close_matches(
+                word=column, possibilities=catalog, n=3, cutoff=0.2
+            )
+            for column in unknown_columns
+        }
+        logger.warning(
+            f"Unknown {data_type} columns: {unknown_columns}. Closest potential matches: {closest_matches}"
+        )
@@ -0,0 +1,90 @@
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Union
+import json
+import os
+
+from loguru import logger
+from .client_all import CheckbookNYC
+from .paging import MAX_PAGE_SIZE, PageSize
+
+CHECKPOINT = "checkpoint.json"
+
+
+def _write_checkpoint(path: Path, checkpoint: Dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(checkpoint, indent=2))
+    os.replace(tmp, path)
+
+
+def export(
+    client: CheckbookNYC,
+    data_type: str,
+    out_dir: Union[str, Path],
+    params: Optional[Dict[str, Union[str, int, float]]] = None,
+    response_columns: Optional[List[str]] = None,
+    format: Literal["csv", "parquet"] = "csv",
+    status: Literal["active", "pending", "registered"] = "active",
+    category: Literal["all", "expense", "revenue"] = "all",
+    page_size: Union[int, PageSize] = MAX_PAGE_SIZE,
+    workers: int = 1,
+) -> Dict[str, Any]:
+    """
+    Streams every page of a query into ``out_dir`` as numbered CSV or Parquet
+    part files. After each page a checkpoint with the next ``records_from`` is
+    written, so running the same export again resumes where it stopped.
+    Returns the final checkpoint.
+    """
+    if format not in ("csv", "parquet"):
+        raise ValueError(f"Invalid format: {format!r}. Expected 'csv' or 'parquet'.")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = out_dir / CHECKPOINT
+    query = {
+        "data_type": client.endpoint(data_type).data_type,
+        "params": {k: str(v) for k, v in (params or {}).items()},
+        "response_columns": response_columns,
+        "format": format,
+        "status": status,
+        "category": category,
+    }
+    checkpoint = {**query, "records_from": 1, "part": 0, "records": 0}
+    if checkpoint_path.exists():
+        checkpoint = json.loads(checkpoint_path.read_text())
+        if {k: checkpoint.get(k) for k in query} != query:
+            raise ValueError(
+                f"{checkpoint_path} belongs to a different export; "
+                "use an empty output directory."
+            )
+        if checkpoint.get("complete"):
+            logger.info(f"Export in {out_dir} is already complete.")
+            return checkpoint
+        logger.info(f"Resuming export from records_from={checkpoint['records_from']}.")
+
+    pages = client.pages(
+        data_type,
+        params,
+        response_columns,
+        status,
+        category,
+        output="pandas",
+        page_size=page_size,
+        workers=workers,
+        records_from=checkpoint["records_from"],
+    )
+    for frame in pages:
+        if len(frame):
+            part = out_dir / f"part-{checkpoint['part']:05d}.{format}"
+            if format == "parquet":
+                frame.to_parquet(part, index=False)
+            else:
+                frame.to_csv(part, index=False)
+            checkpoint["part"] += 1
+        checkpoint["records_from"] += len(frame)
+        checkpoint["records"] += len(frame)
+        _write_checkpoint(checkpoint_path, checkpoint)
+        logger.info(f"Exported {checkpoint['records']} records.")
+
+    checkpoint["complete"] = True
+    _write_checkpoint(checkpoint_path, checkpoint)
+    return checkpoint
@@ -0,0 +1,65 @@
+from typing import Dict, List, Literal, Optional
+
+from .data_params import get_params
+
+Columns = Dict[str, List[Optional[str]]]
+
+
+def column_kind(data_type: str, column: str) -> Literal["numeric", "date", "text"]:
+    """
+    Derives a column's type from the data type's filter schema: ``*_date``
+    columns are dates and the remaining ``range`` filters are numeric.
+    """
+    if column.endswith("_date"):
+        return "date"
+    if get_params(data_type=data_type).get(column) == "range":
+        return "numeric"
+    return "text"
+
+
+def to_pandas(columns: Columns, data_type: str):
+    """
+    Builds a DataFrame directly from parsed column buffers.
+    """
+    import pandas as pd
+
+    data = {}
+    for name, values in columns.items():
+        series = pd.Series(values, dtype="string")
+        try:
+            match column_kind(data_type, name):
+                case "numeric":
+                    series = pd.to_numeric(series)
+                case "date":
+                    series = pd.to_datetime(series, format="ISO8601")
+        except (ValueError, TypeError):
+            pass
+        data[name] = series
+    return pd.DataFrame(data)
+
+
+def to_arrow(columns: Columns, data_type: str):
+    """
+    Builds a ``pyarrow.Table`` directly from parsed column buffers. Requires the
+    optional ``pyarrow`` dependency.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "output='arrow' requires pyarrow. Install it with `pip install pyarrow`."
+        ) from e
+
+    arrays = {}
+    for name, values in columns.items():
+        array = pa.array(values, type=pa.string())
+        try:
+            match column_kind(data_type, name):
+                case "numeric":
+                    array = array.cast(pa.float64())
+                case "date":
+                    array = array.cast(pa.date32())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+        arrays[name] = array
+    return pa.table(arrays)
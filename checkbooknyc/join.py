@@ -0,0 +1,179 @@
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .client_all import CheckbookNYC
+from .data_params import check_columns, get_params
+from .paging import MAX_PAGE_SIZE, PageSize
+from .planner import Shard
+
+On = Union[str, Sequence[str], Mapping[str, str]]
+Key = Tuple[Optional[str], ...]
+
+
+def _pairs(on: On) -> List[Tuple[str, str]]:
+    if isinstance(on, str):
+        return [(on, on)]
+    if isinstance(on, Mapping):
+        return list(on.items())
+    return [(column, column) for column in on]
+
+
+def _key(record: Mapping[str, Any], columns: Sequence[str]) -> Optional[Key]:
+    key = tuple(record.get(column) for column in columns)
+    return None if None in key else key
+
+
+class HashJoin:
+    """
+    Joins the results of two queries, each described by a ``Shard``. The
+    ``build`` side, normally the smaller one, is streamed into a hash index on
+    its join columns; the ``probe`` side is then streamed page by page and each
+    page is joined against the index as it arrives. Memory is bounded by the
+    build side plus one probe page.
+
+    When the build side has at most ``pushdown_limit`` distinct keys and every
+    probe join column is a ``value`` filter, the probe query is replaced by one
+    query per key with the key as filters, so only matching rows are fetched.
+    """
+
+    def __init__(
+        self,
+        client: CheckbookNYC,
+        pushdown_limit: int = 25,
+        workers: int = 1,
+        page_size: Union[int, PageSize] = MAX_PAGE_SIZE,
+    ):
+        self.client = client
+        self.pushdown_limit = pushdown_limit
+        self.workers = workers
+        self.page_size = page_size
+
+    def _pages(self, shard: Shard, columns: Optional[List[str]]):
+        return self.client.pages(
+            shard.data_type,
+            shard.params,
+            columns,
+            shard.status,
+            shard.category,
+            workers=self.workers,
+            page_size=self.page_size,
+        )
+
+    def index(
+        self,
+        build: Shard,
+        columns: Sequence[str],
+        response_columns: Optional[List[str]] = None,
+    ) -> Dict[Key, List[Dict[str, Any]]]:
+        """
+        Streams ``build`` into a mapping of join key to its records. Records
+        with a missing key column cannot match and are left out.
+        """
+        index: Dict[Key, List[Dict[str, Any]]] = {}
+        for records in self._pages(build, response_columns):
+            for record in records:
+                key = _key(record, columns)
+                if key is not None:
+                    index.setdefault(key, []).append(record)
+        return index
+
+    def join(
+        self,
+        build: Shard,
+        probe: Shard,
+        on: On,
+        how: Literal["inner", "left"] = "inner",
+        build_columns: Optional[List[str]] = None,
+        probe_columns: Optional[List[str]] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields one page of joined rows per probe page. ``on`` names columns
+        shared by both sides, or maps probe columns to build columns. Each row
+        is the probe record plus the fields of the matching build record;
+        build fields clashing with probe fields are prefixed with the build data
+        type, as in ``contracts_agency_code``. With ``how="left"`` probe records
+        without a match are kept as they are.
+        """
+        if how not in ("inner", "left"):
+            raise ValueError(f"Invalid how: {how!r}. Expected 'inner' or 'left'.")
+        build = Shard(
+            self.client.endpoint(build.data_type).data_type,
+            build.params,
+            build.status,
+            build.category,
+        )
+        probe = Shard(
+            self.client.endpoint(probe.data_type).data_type,
+            probe.params,
+            probe.status,
+            probe.category,
+        )
+        pairs = _pairs(on)
+        probe_keys = [p for p, _ in pairs]
+        build_keys = [b for _, b in pairs]
+        check_columns(probe.data_type, probe_keys)
+        check_columns(build.data_type, build_keys)
+        if build_columns:
+            build_columns = list(dict.fromkeys([*build_keys, *build_columns]))
+        if probe_columns:
+            probe_columns = list(dict.fromkeys([*probe_keys, *probe_columns]))
+
+        index = self.index(build, build_keys, build_columns)
+        prefix = f"{build.data_type.lower()}_"
+        for records in self._probe(probe, probe_keys, index, how, probe_columns):
+            rows = []
+            for record in records:
+                key = _key(record, probe_keys)
+                matches = index.get(key) if key is not None else None
+                if not matches:
+                    if how == "left":
+                        rows.append(record)
+                    continue
+                for match in matches:
+                    row = dict(record)
+                    for name, value in match.items():
+                        if name in build_keys:
+                            continue
+                        row[prefix + name if name in record else name] = value
+                    rows.append(row)
+            yield rows
+
+    def _probe(
+        self,
+        probe: Shard,
+        keys: List[str],
+        index: Dict[Key, List[Dict[str, Any]]],
+        how: str,
+        columns: Optional[List[str]],
+    ):
+        if how == "inner" and not index:
+            return
+        parameters = get_params(data_type=probe.data_type)
+        if (
+            how == "inner"
+            and len(index) <= self.pushdown_limit
+            and all(
+                parameters.get(key) == "value" and key not in probe.params
+                for key in keys
+            )
+        ):
+            for key in index:
+                shard = Shard(
+                    probe.data_type,
+                    {**probe.params, **dict(zip(keys, key))},
+                    probe.status,
+                    probe.category,
+                )
+                yield from self._pages(shard, columns)
+            return
+        yield from self._pages(probe, columns)
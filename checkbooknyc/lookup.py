@@ -0,0 +1,89 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import difflib
+
+from .data_params import get_params
+from .records import _to_date
+
+
+def _point(name: str, value: Any) -> Any:
+    """
+    Normalises a ``range`` field value so the API's text and the caller's
+    numbers or dates compare equal, for example ``"100.00"`` and ``100``.
+    """
+    text = str(value)
+    if name.endswith("_date"):
+        return _to_date(text)
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+class Lookup:
+    """
+    Plans a batched point lookup of ``values`` of the filter ``key``. Values are
+    deduplicated as text. The API takes one value per criterion, so a ``value``
+    filter costs one query per key; a ``range`` filter instead covers up to
+    ``window`` sorted keys with one ``(start, end)`` query whose records are
+    matched back to the keys locally.
+    """
+
+    def __init__(
+        self, data_type: str, key: str, values: Iterable[Any], window: int = 100
+    ):
+        parameters = get_params(data_type=data_type)
+        if key not in parameters:
+            closest_matches = difflib.get_close_matches(
+                word=key, possibilities=parameters.keys(), n=3, cutoff=0.2
+            )
+            raise ValueError(
+                f"Invalid lookup key: {key!r}. Closest potential matches: {closest_matches}"
+            )
+        if window < 1:
+            raise ValueError(f"Invalid window: {window}. Expected at least 1.")
+        self.data_type = data_type
+        self.key = key
+        self.window = window
+        self.ranged = parameters[key] == "range"
+        self.values = list(dict.fromkeys(str(value) for value in values))
+        self.results: Dict[str, List[Dict[str, Any]]] = {
+            value: [] for value in self.values
+        }
+
+    def queries(
+        self, params: Optional[Dict[str, Any]], values: Sequence[str]
+    ) -> List[Tuple[Dict[str, Any], List[str]]]:
+        """
+        Returns the ``(params, keys)`` queries answering ``values`` on top of the
+        shared ``params`` filters.
+        """
+        params = dict(params or {})
+        if self.key in params:
+            raise ValueError(f"{self.key!r} is the lookup key and cannot be a filter.")
+        if not self.ranged:
+            return [({**params, self.key: value}, [value]) for value in values]
+        ordered = sorted(values, key=lambda value: _point(self.key, value))
+        return [
+            (
+                {**params, self.key: (batch[0], batch[-1])},
+                batch,
+            )
+            for batch in (
+                ordered[i : i + self.window]
+                for i in range(0, len(ordered), self.window)
+            )
+        ]
+
+    def update(self, keys: Sequence[str], records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Files the records of the query for ``keys`` under their key.
+        """
+        if not self.ranged:
+            self.results[keys[0]].extend(records)
+            return
+        wanted = {_point(self.key, key): key for key in keys}
+        for record in records:
+            value = record.get(self.key)
+            key = wanted.get(_point(self.key, value)) if value is not None else None
+            if key is not None:
+                self.results[key].append(record)
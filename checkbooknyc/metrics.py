@@ -0,0 +1,220 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import bisect
+import threading
+import time
+
+
+@dataclass
+class RequestEvent:
+    """
+    What happened during one API request. ``latency`` is the time until the
+    response headers arrived, ``network_seconds`` all time spent waiting on the
+    server or the cache (including ``latency``) and ``parse_seconds`` the time
+    spent turning the body into records. Time the caller spends between
+    streamed records is not counted. ``shared`` marks a request answered by an
+    identical request already in flight. ``request_wire_bytes`` and
+    ``wire_bytes`` are the request and response body sizes on the wire, after
+    compression, where the transport reports them.
+    """
+
+    data_type: str
+    request_bytes: int
+    records_from: Optional[int] = None
+    max_records: Optional[int] = None
+    response_bytes: int = 0
+    request_wire_bytes: Optional[int] = None
+    wire_bytes: Optional[int] = None
+    latency: float = 0.0
+    network_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    seconds: float = 0.0
+    records: int = 0
+    retries: int = 0
+    cached: bool = False
+    shared: bool = False
+    error: Optional[str] = None
+    started: float = field(default_factory=time.perf_counter)
+
+
+class Hook:
+    """
+    Receives request events from the clients. Subclass and override either
+    method; both are called on the thread that runs the request.
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        pass
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        pass
+
+
+# Default histogram buckets: seconds for timings, records for page sizes.
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RECORDS_BUCKETS = (0, 10, 100, 1_000, 5_000, 10_000, 20_000)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus sense.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total, rows = 0, []
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            rows.append((str(bound), total))
+        return rows
+
+
+_COUNTERS = {
+    "requests_total": "Requests started.",
+    "request_errors_total": "Requests that raised an error.",
+    "retries_total": "Retried attempts.",
+    "cache_hits_total": "Requests answered from the response cache.",
+    "shared_requests_total": "Requests answered by an identical request in flight.",
+    "request_bytes_total": "Bytes of request bodies sent.",
+    "response_bytes_total": "Bytes of response bodies received, decoded.",
+    "request_wire_bytes_total": "Bytes of request bodies sent, as compressed.",
+    "response_wire_bytes_total": "Bytes of response bodies received, as encoded.",
+    "records_total": "Records parsed.",
+}
+
+_HISTOGRAMS = {
+    "request_latency_seconds": ("Time until the response headers arrived.", "s"),
+    "network_seconds": ("Time spent waiting on the server or cache.", "s"),
+    "parse_seconds": ("Time spent parsing responses.", "s"),
+    "records_per_page": ("Records returned per request.", "records"),
+}
+
+
+def _number(value: float) -> str:
+    """
+    Formats a sample value exactly: whole numbers as integers, others with
+    every significant digit.
+    """
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metrics(Hook):
+    """
+    Hook aggregating request events into counters and histograms per data type.
+    ``to_prometheus`` renders them in the Prometheus text exposition format.
+    """
+
+    def __init__(self, prefix: str = "checkbooknyc"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[str, float]] = {
+            name: defaultdict(float) for name in _COUNTERS
+        }
+        self.histograms: Dict[str, Dict[str, Histogram]] = {
+            name: defaultdict(
+                lambda unit=unit: Histogram(
+                    RECORDS_BUCKETS if unit == "records" else SECONDS_BUCKETS
+                )
+            )
+            for name, (_, unit) in _HISTOGRAMS.items()
+        }
+        # Decoded bytes of the responses counted in response_wire_bytes_total.
+        self._network_bytes: Dict[str, float] = defaultdict(float)
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.counters["requests_total"][event.data_type] += 1
+            self.counters["request_bytes_total"][event.data_type] += event.request_bytes
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        data_type = event.data_type
+        with self._lock:
+            counters, histograms = self.counters, self.histograms
+            counters["response_bytes_total"][data_type] += event.response_bytes
+            if not (event.cached or event.shared):
+                self._network_bytes[data_type] += event.response_bytes
+                counters["request_wire_bytes_total"][data_type] += (
+                    event.request_wire_bytes
+                    if event.request_wire_bytes is not None
+                    else event.request_bytes
+                )
+                counters["response_wire_bytes_total"][data_type] += (
+                    event.wire_bytes
+                    if event.wire_bytes is not None
+                    else event.response_bytes
+                )
+            counters["records_total"][data_type] += event.records
+            counters["retries_total"][data_type] += event.retries
+            if event.cached:
+                counters["cache_hits_total"][data_type] += 1
+            if event.shared:
+                counters["shared_requests_total"][data_type] += 1
+            if event.error is not None:
+                counters["request_errors_total"][data_type] += 1
+            if not (event.cached or event.shared):
+                histograms["request_latency_seconds"][data_type].observe(event.latency)
+            histograms["network_seconds"][data_type].observe(event.network_seconds)
+            histograms["parse_seconds"][data_type].observe(event.parse_seconds)
+            histograms["records_per_page"][data_type].observe(event.records)
+
+    def compression_ratios(self) -> Dict[str, float]:
+        """
+        Returns decoded over on-the-wire response bytes per data type, for the
+        responses that came from the network.
+        """
+        with self._lock:
+            return self._ratios()
+
+    def _ratios(self) -> Dict[str, float]:
+        wire = self.counters["response_wire_bytes_total"]
+        return {
+            data_type: self._network_bytes[data_type] / wire_bytes
+            for data_type, wire_bytes in wire.items()
+            if wire_bytes
+        }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, help_text in _COUNTERS.items():
+                metric = f"{self.prefix}_{name}"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                for data_type, value in sorted(self.counters[name].items()):
+                    lines.append(
+                        f'{metric}{{data_type="{data_type}"}} {_number(value)}'
+                    )
+            metric = f"{self.prefix}_response_compression_ratio"
+            lines += [
+                f"# HELP {metric} Decoded over on-the-wire response bytes.",
+                f"# TYPE {metric} gauge",
+            ]
+            for data_type, ratio in sorted(self._ratios().items()):
+                lines.append(f'{metric}{{data_type="{data_type}"}} {_number(ratio)}')
+            for name, (help_text, _) in _HISTOGRAMS.items():
+                metric = f"{self.prefix}_{name}"
+                lines += [
+                    f"# HELP {metric} {help_text}",
+                    f"# TYPE {metric} histogram",
+                ]
+                for data_type, histogram in sorted(self.histograms[name].items()):
+                    labels = f'data_type="{data_type}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(
+                            f'{metric}_bucket{{{labels},le="{bound}"}} {count}'
+                        )
+                    lines.append(f"{metric}_sum{{{labels}}} {_number(histogram.sum)}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
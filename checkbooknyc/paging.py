@@ -0,0 +1,167 @@
+from collections import deque
+from typing import Any, Deque, Iterator, Optional, Tuple, TypeVar
+import sys
+import threading
+
+T = TypeVar("T")
+
+MAX_PAGE_SIZE = 20_000
+
+
+class PageSize:
+    """
+    Fixed page size policy. The pagers ask ``next()`` for the size of each
+    window they request and report every finished page to ``record``.
+    """
+
+    def __init__(self, size: int = MAX_PAGE_SIZE):
+        if not 1 <= size <= MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Invalid page size: {size}. Expected a value between 1 and {MAX_PAGE_SIZE}."
+            )
+        self.size = size
+
+    def next(self) -> int:
+        return self.size
+
+    def record(self, requested: int, received: int, seconds: float) -> None:
+        pass
+
+
+class AdaptivePageSize(PageSize):
+    """
+    Page size policy that tunes itself from observed throughput. After each full
+    page the next size is chosen so a page takes about ``target_seconds``,
+    changing by at most a factor of two per step and staying within
+    ``min_size`` and ``max_size``.
+    """
+
+    def __init__(
+        self,
+        initial: int = 2_000,
+        min_size: int = 100,
+        max_size: int = MAX_PAGE_SIZE,
+        target_seconds: float = 5.0,
+    ):
+        super().__init__(initial)
+        if not 1 <= min_size <= initial <= max_size <= MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Invalid page size bounds: {min_size} <= {initial} <= {max_size} "
+                f"must hold within 1 and {MAX_PAGE_SIZE}."
+            )
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+
+    def record(self, requested: int, received: int, seconds: float) -> None:
+        # A short page is the end of the data and says little about throughput.
+        if received < requested or seconds <= 0:
+            return
+        ideal = int(received / seconds * self.target_seconds)
+        ideal = max(self.size // 2, min(self.size * 2, ideal))
+        self.size = max(self.min_size, min(self.max_size, ideal))
+
+
+def estimate_bytes(page: Any) -> int:
+    """
+    Estimates the memory held by a page: the deep size of a DataFrame, the
+    buffer size of an Arrow table, or the container and value sizes of a list
+    of records. Field names are shared between records and not counted.
+    """
+    if hasattr(page, "memory_usage"):
+        return int(page.memory_usage(deep=True).sum())
+    if hasattr(page, "nbytes"):
+        return int(page.nbytes)
+    if isinstance(page, (bytes, str)):
+        return len(page)
+    size = sys.getsizeof(page)
+    for record in page:
+        size += sys.getsizeof(record)
+        if isinstance(record, dict):
+            values = record.values()
+        else:
+            values = (
+                getattr(record, name, None) for name in getattr(record, "__slots__", ())
+            )
+        size += sum(sys.getsizeof(value) for value in values)
+    return size
+
+
+def prefetch(
+    pages: Iterator[T], depth: int = 2, max_bytes: Optional[int] = None
+) -> Iterator[T]:
+    """
+    Yields ``pages`` in order while a background thread reads ahead of the
+    consumer. At most ``depth`` pages wait in the buffer, and no further page
+    is requested while the buffered pages and another page the size of the last
+    one would exceed ``max_bytes``, so a slow consumer pauses the downloads.
+    A page larger than ``max_bytes`` is still fetched once the buffer is empty.
+    Errors are raised after the pages fetched before them. Closing the
+    generator stops the reader after its current page.
+    """
+    if depth < 1:
+        raise ValueError(f"Invalid prefetch depth: {depth}. Expected at least 1.")
+
+    buffer: Deque[Tuple[T, int]] = deque()
+    ready = threading.Condition()
+    buffered = 0
+    finished = closed = False
+    error: Optional[BaseException] = None
+
+    def full(last: int) -> bool:
+        if not buffer:
+            return False
+        return len(buffer) >= depth or (
+            max_bytes is not None and buffered + last > max_bytes
+        )
+
+    def read_ahead() -> None:
+        nonlocal buffered, finished, error
+        last = 0
+        try:
+            while True:
+                with ready:
+                    while full(last) and not closed:
+                        ready.wait()
+                    if closed:
+                        return
+                try:
+                    page = next(pages)
+                except StopIteration:
+                    return
+                last = estimate_bytes(page)
+                with ready:
+                    buffer.append((page, last))
+                    buffered += last
+                    ready.notify_all()
+        except BaseException as e:
+            error = e
+        finally:
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
+            with ready:
+                finished = True
+                ready.notify_all()
+
+    thread = threading.Thread(target=read_ahead, name="checkbooknyc-prefetch")
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            with ready:
+                while not buffer and not finished:
+                    ready.wait()
+                if not buffer:
+                    if error is not None:
+                        raise error
+                    return
+                page, size = buffer.popleft()
+                buffered -= size
+                ready.notify_all()
+            yield page
+    finally:
+        with ready:
+            closed = True
+            buffer.clear()
+            ready.notify_all()
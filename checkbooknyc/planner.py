@@ -0,0 +1,175 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
+import itertools
+import json
+
+from .client_all import CheckbookNYC
+from .data_params import get_params
+from .paging import MAX_PAGE_SIZE, PageSize
+
+Range = Tuple[Any, Any]
+
+
+@dataclass
+class Shard:
+    """
+    One independent sub-query of a larger query.
+    """
+
+    data_type: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: Literal["active", "pending", "registered"] = "active"
+    category: Literal["all", "expense", "revenue"] = "all"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Shard":
+        # JSON has no tuples, so range bounds come back as two-item lists.
+        params = {
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in data.get("params", {}).items()
+        }
+        return cls(**{**data, "params": params})
+
+
+def date_ranges(
+    start: Union[str, date], end: Union[str, date], parts: int
+) -> List[Range]:
+    """
+    Splits the inclusive date range ``start``..``end`` into ``parts`` adjacent,
+    non-overlapping ranges of whole days.
+    """
+    start, end = date.fromisoformat(str(start)), date.fromisoformat(str(end))
+    days = (end - start).days + 1
+    if parts < 1 or days < 1:
+        raise ValueError(f"Cannot split {start}..{end} into {parts} parts.")
+    bounds = [start + timedelta(days=days * i // parts) for i in range(parts + 1)]
+    return [
+        (lo.isoformat(), (hi - timedelta(days=1)).isoformat())
+        for lo, hi in zip(bounds, bounds[1:])
+        if hi > lo
+    ]
+
+
+def amount_ranges(
+    start: float, end: float, parts: int, precision: float = 0.01
+) -> List[Range]:
+    """
+    Splits the inclusive amount range ``start``..``end`` into ``parts`` adjacent
+    ranges. Each range stops ``precision`` short of the next one so no amount is
+    matched twice.
+    """
+    if parts < 1 or end < start:
+        raise ValueError(f"Cannot split {start}..{end} into {parts} parts.")
+    width = (end - start) / parts
+    bounds = [round(start + width * i, 2) for i in range(parts)] + [end]
+    return [
+        (lo, round(hi - precision, 2) if i < parts - 1 else hi)
+        for i, (lo, hi) in enumerate(zip(bounds, bounds[1:]))
+    ]
+
+
+class QueryPlanner:
+    """
+    Splits a broad query into independent shards on ``value`` filters such as
+    ``fiscal_year`` and ``agency_code`` or ``range`` filters such as
+    ``issue_date`` and ``check_amount``, and runs the shards in parallel.
+    """
+
+    def __init__(self, client: CheckbookNYC):
+        self.client = client
+
+    def plan(
+        self,
+        data_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        by: Optional[Dict[str, Sequence[Any]]] = None,
+        status: Literal["active", "pending", "registered"] = "active",
+        category: Literal["all", "expense", "revenue"] = "all",
+    ) -> List[Shard]:
+        """
+        Returns one shard per combination of the values in ``by``. Each value is
+        a single filter value or, for ``range`` filters, a ``(start, end)`` pair
+        as produced by ``date_ranges`` and ``amount_ranges``.
+        """
+        data_type = self.client.endpoint(data_type).data_type
+        params = dict(params or {})
+        by = by or {}
+        parameters = get_params(data_type=data_type)
+        for key, values in by.items():
+            if key not in parameters:
+                raise ValueError(f"Invalid split parameter: {key!r}.")
+            if key in params:
+                raise ValueError(f"Cannot split on {key!r}, it is already filtered.")
+            if not values:
+                raise ValueError(f"No values given to split {key!r} on.")
+
+        return [
+            Shard(data_type, {**params, **dict(zip(by, combo))}, status, category)
+            for combo in itertools.product(*by.values())
+        ]
+
+    def save(self, shards: List[Shard], path: Union[str, Path]) -> None:
+        """
+        Writes ``shards`` as JSON so they can be handed out to worker nodes.
+        """
+        Path(path).write_text(json.dumps([asdict(s) for s in shards], indent=2))
+
+    def load(self, path: Union[str, Path]) -> List[Shard]:
+        return [Shard.from_dict(s) for s in json.loads(Path(path).read_text())]
+
+    def fetch(
+        self,
+        shard: Shard,
+        response_columns: Optional[List[str]] = None,
+        output: Literal["records", "typed", "pandas"] = "records",
+        page_size: Union[int, PageSize] = MAX_PAGE_SIZE,
+    ):
+        """
+        Fetches every page of one shard and merges them.
+        """
+        pages = list(
+            self.client.pages(
+                shard.data_type,
+                shard.params,
+                response_columns,
+                shard.status,
+                shard.category,
+                output=output,
+                page_size=page_size,
+            )
+        )
+        return _merge(pages, output)
+
+    def run(
+        self,
+        shards: List[Shard],
+        workers: int = 4,
+        response_columns: Optional[List[str]] = None,
+        output: Literal["records", "typed", "pandas"] = "records",
+        page_size: Union[int, PageSize] = MAX_PAGE_SIZE,
+    ):
+        """
+        Fetches ``shards`` in parallel and merges the results in shard order.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    lambda shard: self.fetch(
+                        shard, response_columns, output, page_size
+                    ),
+                    shards,
+                )
+            )
+        return _merge(results, output)
+
+
+def _merge(parts: List[Any], output: str):
+    if output == "pandas":
+        import pandas as pd
+
+        parts = [part for part in parts if len(part)]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    return list(itertools.chain.from_iterable(parts))
@@ -0,0 +1,144 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from functools import cache
+from typing import Any, Callable, Dict, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+from .data_params import get_params
+
+YEAR_FIELDS = {"fiscal_year", "year", "calendar_year", "budget_fiscal_year"}
+
+
+def _to_decimal(text: str):
+    try:
+        return Decimal(text.replace(",", ""))
+    except InvalidOperation:
+        return text
+
+
+def _to_date(text: str):
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        return text
+
+
+def _to_int(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def converter(data_type: str, field: str) -> Optional[Callable[[str], Any]]:
+    """
+    Returns the function converting a field's text to its typed value, or
+    ``None`` when the field stays a string.
+    """
+    if field.endswith("_date"):
+        return _to_date
+    if field in YEAR_FIELDS:
+        return _to_int
+    if get_params(data_type=data_type).get(field) == "range":
+        return _to_decimal
+    return None
+
+
+class Record:
+    """
+    Compact, typed transaction. Subclasses generated by ``record_type`` declare
+    one slot per field, so rows carry no per-instance dict. Tags outside the
+    declared fields are kept in ``extra``.
+    """
+
+    __slots__ = ("extra",)
+    data_type: str = ""
+    _fields: Tuple[str, ...] = ()
+    _converters: Dict[str, Callable[[str], Any]] = {}
+
+    def __init__(self, **values: Any):
+        for field in self._fields:
+            setattr(self, field, values.pop(field, None))
+        self.extra = values or None
+
+    @classmethod
+    def from_element(cls, elem: ET.Element) -> "Record":
+        record = cls()
+        converters = cls._converters
+        for child in elem:
+            tag, text = child.tag, child.text
+            if text is not None and tag in converters:
+                text = converters[tag](text)
+            if tag in cls._fields:
+                setattr(record, tag, text)
+            else:
+                if record.extra is None:
+                    record.extra = {}
+                record.extra[tag] = text
+        return record
+
+    @classmethod
+    def from_row(
+        cls, names: Tuple[str, ...], values: Tuple[Optional[str], ...]
+    ) -> "Record":
+        record = cls()
+        converters = cls._converters
+        for tag, text in zip(names, values):
+            if text is not None and tag in converters:
+                text = converters[tag](text)
+            if tag in cls._fields:
+                setattr(record, tag, text)
+            elif text is not None:
+                if record.extra is None:
+                    record.extra = {}
+                record.extra[tag] = text
+        return record
+
+    def as_dict(self) -> Dict[str, Any]:
+        values = {field: getattr(self, field) for field in self._fields}
+        if self.extra:
+            values.update(self.extra)
+        return values
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Record):
+            return NotImplemented
+        return self.data_type == other.data_type and self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{field}={getattr(self, field)!r}"
+            for field in self._fields
+            if getattr(self, field) is not None
+        )
+        return f"{type(self).__name__}({values})"
+
+
+@cache
+def record_type(data_type: str, columns: Tuple[str, ...] = ()) -> type:
+    """
+    Builds (once) the record class for ``data_type``. Its fields are the
+    data type's parameters from ``data_params`` plus any extra ``columns``, for
+    example the tags seen in an actual response.
+    """
+    fields = tuple(get_params(data_type=data_type))
+    fields += tuple(
+        column
+        for column in columns
+        if column not in fields and column.isidentifier() and column != "extra"
+    )
+    converters = {
+        field: convert
+        for field in fields
+        if (convert := converter(data_type, field)) is not None
+    }
+    return type(
+        f"{data_type}Record",
+        (Record,),
+        {
+            "__slots__": fields,
+            "data_type": data_type,
+            "_fields": fields,
+            "_converters": converters,
+        },
+    )
@@ -0,0 +1,100 @@
+from functools import lru_cache
+from typing import List, NamedTuple, NotRequired, Optional, Tuple, TypedDict
+from xml.sax.saxutils import escape
+import hashlib
+import json
+
+
+class Criteria(TypedDict):
+    name: str
+    type: str
+    value: NotRequired[str]
+    start: NotRequired[str]
+    end: NotRequired[str]
+
+
+# (name, type, value, start, end) with ``None`` for the parts a criterion lacks.
+Criterion = Tuple[str, str, Optional[str], Optional[str], Optional[str]]
+
+
+class Request(NamedTuple):
+    """
+    Immutable, canonical form of an API request. Criteria are sorted so the same
+    filters given in any order produce an equal (and equally hashed) request,
+    which makes it usable directly as a cache or de-duplication key.
+    """
+
+    data_type: str
+    criteria: Tuple[Criterion, ...] = ()
+    records_from: Optional[int] = None
+    max_records: Optional[int] = None
+    response_columns: Tuple[str, ...] = ()
+
+    @classmethod
+    def build(
+        cls,
+        data_type: str,
+        criteria: Optional[List[Criteria]] = None,
+        records_from: Optional[int] = None,
+        max_records: Optional[int] = None,
+        response_columns: Optional[List[str]] = None,
+    ) -> "Request":
+        return cls(
+            data_type,
+            tuple(
+                sorted(
+                    (
+                        c["name"],
+                        c["type"],
+                        c.get("value"),
+                        c.get("start"),
+                        c.get("end"),
+                    )
+                    for c in criteria or ()
+                )
+            ),
+            records_from,
+            max_records,
+            tuple(response_columns or ()),
+        )
+
+    @property
+    def xml(self) -> str:
+        return _render(self)
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps(self).encode()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _prefix(data_type: str) -> str:
+    return f"<request><type_of_data>{escape(data_type)}</type_of_data>"
+
+
+@lru_cache(maxsize=4096)
+def _criterion(criterion: Criterion) -> str:
+    name, type_, *bounds = criterion
+    parts = "".join(
+        f"<{tag}>{escape(text)}</{tag}>"
+        for tag, text in zip(("value", "start", "end"), bounds)
+        if text is not None
+    )
+    return (
+        f"<criteria><name>{escape(name)}</name><type>{type_}</type>{parts}</criteria>"
+    )
+
+
+@lru_cache(maxsize=4096)
+def _render(request: Request) -> str:
+    parts = [_prefix(request.data_type)]
+    if request.records_from:
+        parts.append(f"<records_from>{request.records_from}</records_from>")
+    if request.max_records:
+        parts.append(f"<max_records>{request.max_records}</max_records>")
+    parts.append("<search_criteria>")
+    parts.extend(map(_criterion, request.criteria))
+    parts.append("</search_criteria><response_columns>")
+    parts.extend(f"<column>{escape(c)}</column>" for c in request.response_columns)
+    parts.append("</response_columns></request>")
+    return "".join(parts)
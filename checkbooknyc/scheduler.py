@@ -0,0 +1,149 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Union
+import heapq
+import itertools
+import time
+
+from loguru import logger
+
+from .client_all import CheckbookNYC
+from .paging import MAX_PAGE_SIZE, PageSize
+from .planner import _merge
+
+
+@dataclass
+class Job:
+    """
+    One query to run. With ``max_records`` only that many records are fetched,
+    in one request; otherwise every page is. ``priority`` orders waiting jobs,
+    lowest first, and defaults to putting such small queries ahead of bulk
+    pulls.
+    """
+
+    data_type: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: Literal["active", "pending", "registered"] = "active"
+    category: Literal["all", "expense", "revenue"] = "all"
+    response_columns: Optional[List[str]] = None
+    output: Literal["records", "typed", "pandas"] = "records"
+    max_records: Optional[int] = None
+    page_size: Union[int, PageSize] = MAX_PAGE_SIZE
+    workers: int = 1
+    priority: Optional[int] = None
+    name: Optional[str] = None
+
+    def __post_init__(self):
+        if self.priority is None:
+            self.priority = 0 if self.max_records is not None else 10
+
+
+@dataclass
+class JobResult:
+    job: Job
+    result: Any = None
+    error: Optional[BaseException] = None
+    seconds: float = 0.0
+
+
+class Scheduler:
+    """
+    Runs a batch of jobs across endpoints concurrently. At most ``concurrency``
+    jobs run at once, and at most ``per_endpoint[data_type]`` of them against
+    one endpoint. Waiting jobs start in priority order as slots free up, and
+    results are yielded as each job finishes.
+    """
+
+    def __init__(
+        self,
+        client: CheckbookNYC,
+        concurrency: int = 5,
+        per_endpoint: Optional[Dict[str, int]] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        invalid_limits = {
+            data_type: limit
+            for data_type, limit in (per_endpoint or {}).items()
+            if limit < 1
+        }
+        if invalid_limits:
+            raise ValueError(
+                f"Invalid per_endpoint limits: {invalid_limits}. Each must be at least 1."
+            )
+        self.client = client
+        self.concurrency = concurrency
+        self.per_endpoint = {
+            client.endpoint(data_type).data_type: limit
+            for data_type, limit in (per_endpoint or {}).items()
+        }
+
+    def execute(self, job: Job) -> Any:
+        if job.max_records is not None:
+            pages = self.client.pages(
+                job.data_type,
+                job.params,
+                job.response_columns,
+                job.status,
+                job.category,
+                output=job.output,
+                page_size=job.max_records,
+            )
+            try:
+                return next(pages)
+            finally:
+                pages.close()
+        pages = self.client.pages(
+            job.data_type,
+            job.params,
+            job.response_columns,
+            job.status,
+            job.category,
+            output=job.output,
+            page_size=job.page_size,
+            workers=job.workers,
+        )
+        return _merge(list(pages), job.output)
+
+    def _timed(self, job: Job) -> JobResult:
+        start = time.perf_counter()
+        try:
+            result = JobResult(job, self.execute(job))
+        except Exception as e:
+            logger.error(f"Job {job.name or job.data_type} failed: {e}")
+            result = JobResult(job, error=e)
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def run(self, jobs: Iterable[Job]) -> Iterator[JobResult]:
+        """
+        Yields a ``JobResult`` for every job in completion order. A failed job
+        carries its exception in ``error`` and does not stop the others.
+        """
+        counter = itertools.count()
+        waiting = []
+        for job in jobs:
+            endpoint = self.client.endpoint(job.data_type).data_type
+            heapq.heappush(waiting, (job.priority, next(counter), endpoint, job))
+
+        active: Dict[str, int] = {}
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while waiting or running:
+                blocked = []
+                while waiting and len(running) < self.concurrency:
+                    item = heapq.heappop(waiting)
+                    endpoint = item[2]
+                    limit = self.per_endpoint.get(endpoint)
+                    if limit is not None and active.get(endpoint, 0) >= limit:
+                        blocked.append(item)
+                        continue
+                    active[endpoint] = active.get(endpoint, 0) + 1
+                    running[executor.submit(self._timed, item[3])] = endpoint
+                for item in blocked:
+                    heapq.heappush(waiting, item)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    active[running.pop(future)] -= 1
+                    yield future.result()
@@ -0,0 +1,297 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import hashlib
+import json
+import sqlite3
+import threading
+
+from .data_params import get_params
+
+# Fields identifying a record across runs. Data types without a reliable
+# identifier are deduplicated on the full record contents instead.
+NATURAL_KEYS: Dict[str, Optional[Sequence[str]]] = {
+    "Contracts": ("contract_id",),
+    "Spending": None,
+    "Payroll": None,
+    "Budget": None,
+    "Revenue": None,
+}
+
+
+# Common filter keys that get an index wherever the data type has them.
+INDEXED_FIELDS = ("agency_code", "fiscal_year", "year", "vendor_code", "payee_code")
+
+
+def _canonical(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        name: (
+            [None if v is None else str(v) for v in value]
+            if isinstance(value, (tuple, list))
+            else str(value)
+        )
+        for name, value in (params or {}).items()
+    }
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class LocalStore:
+    """
+    SQLite store of fetched transactions with one table per data type. Each
+    table has a column per filter in ``data_params`` plus the full record as
+    JSON, and is keyed on the data type's natural key so re-fetched records
+    replace their earlier copies. The common filter keys are indexed. The
+    ``scope`` holds criteria that are not record fields, such as the status and
+    category of a Contracts query.
+
+    The store also remembers which queries it holds completely, so ``query`` can
+    answer any query at least as narrow as one of them without the API.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS _watermarks (
+                query TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS _coverage (
+                data_type TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                params TEXT NOT NULL,
+                PRIMARY KEY (data_type, scope, params)
+            )
+            """
+        )
+        self._tables = set()
+
+    def _table(self, data_type: str) -> str:
+        table = data_type.lower()
+        if table not in self._tables:
+            columns = "".join(
+                f', "{field}" TEXT' for field in get_params(data_type=data_type)
+            )
+            self._db.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}" (_scope TEXT NOT NULL, '
+                f"_key TEXT NOT NULL{columns}, _record TEXT NOT NULL, "
+                "PRIMARY KEY (_scope, _key))"
+            )
+            for field in INDEXED_FIELDS:
+                if field in get_params(data_type=data_type):
+                    self._db.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{table}_{field}" '
+                        f'ON "{table}" ("{field}")'
+                    )
+            self._tables.add(table)
+        return table
+
+    def _key(
+        self, data_type: str, record: Dict[str, Any], key: Optional[Sequence[str]]
+    ) -> str:
+        key = key if key is not None else NATURAL_KEYS.get(data_type)
+        if key and all(record.get(field) is not None for field in key):
+            return "\x1f".join(str(record[field]) for field in key)
+        return hashlib.sha256(
+            json.dumps(record, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def upsert(
+        self,
+        data_type: str,
+        records: Iterable[Dict[str, Any]],
+        key: Optional[Sequence[str]] = None,
+        scope: Sequence[str] = (),
+        merge: bool = False,
+    ) -> int:
+        """
+        Inserts ``records``, replacing stored records with the same natural key
+        (``key`` overrides the data type's default). Returns the number of rows
+        written. With ``merge`` the records may be partial, such as projected
+        rows: their fields are merged into the stored record with the same key.
+        Partial records cannot be told apart by their contents, so ``merge``
+        requires every record to carry its natural key.
+        """
+        fields = list(get_params(data_type=data_type))
+        placeholders = ", ".join("?" * (len(fields) + 3))
+        scope_json = json.dumps(list(scope))
+        natural = key if key is not None else NATURAL_KEYS.get(data_type)
+        keyed = []
+        for record in records:
+            if merge and not (
+                natural and all(record.get(field) is not None for field in natural)
+            ):
+                raise ValueError(
+                    f"Merging partial {data_type} records requires the key "
+                    f"fields {list(natural or ())} in every record."
+                )
+            keyed.append((self._key(data_type, record, key), record))
+
+        with self._lock:
+            table = self._table(data_type)
+            rows = []
+            for record_key, record in keyed:
+                if merge:
+                    stored = self._db.execute(
+                        f'SELECT _record FROM "{table}" WHERE _scope = ? AND _key = ?',
+                        (scope_json, record_key),
+                    ).fetchone()
+                    if stored:
+                        record = {**json.loads(stored[0]), **record}
+                rows.append(
+                    (
+                        scope_json,
+                        record_key,
+                        *(_text(record.get(field)) for field in fields),
+                        json.dumps(record, default=str),
+                    )
+                )
+            self._db.executemany(
+                f'INSERT OR REPLACE INTO "{table}" VALUES ({placeholders})', rows
+            )
+            self._db.commit()
+        return len(rows)
+
+    def records(
+        self, data_type: str, scope: Sequence[str] = ()
+    ) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                f'SELECT _record FROM "{self._table(data_type)}" WHERE _scope = ?',
+                (json.dumps(list(scope)),),
+            ).fetchall()
+        return (json.loads(row[0]) for row in rows)
+
+    def count(self, data_type: str) -> int:
+        with self._lock:
+            return self._db.execute(
+                f'SELECT COUNT(*) FROM "{self._table(data_type)}"'
+            ).fetchone()[0]
+
+    def get_watermark(self, query: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM _watermarks WHERE query = ?", (query,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, query: str, value: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO _watermarks VALUES (?, ?)", (query, value)
+            )
+            self._db.commit()
+
+    def mark_covered(
+        self,
+        data_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        scope: Sequence[str] = (),
+    ) -> None:
+        """
+        Records that the store holds every record matching ``params``.
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO _coverage VALUES (?, ?, ?)",
+                (
+                    data_type,
+                    json.dumps(list(scope)),
+                    json.dumps(_canonical(params), sort_keys=True),
+                ),
+            )
+            self._db.commit()
+
+    def covering(
+        self,
+        data_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        scope: Sequence[str] = (),
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the stored query covering ``params``, that is one whose every
+        filter ``params`` repeats with the same value, or ``None``.
+        """
+        wanted = _canonical(params)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT params FROM _coverage WHERE data_type = ? AND scope = ?",
+                (data_type, json.dumps(list(scope))),
+            ).fetchall()
+        for (stored,) in rows:
+            stored = json.loads(stored)
+            if all(wanted.get(name) == value for name, value in stored.items()):
+                return stored
+        return None
+
+    def _lacks_fields(
+        self, data_type: str, fields: Sequence[str], scope: Sequence[str]
+    ) -> bool:
+        missing = " OR ".join("json_type(_record, ?) IS NULL" for _ in fields)
+        with self._lock:
+            return (
+                self._db.execute(
+                    f'SELECT 1 FROM "{self._table(data_type)}" '
+                    f"WHERE _scope = ? AND ({missing}) LIMIT 1",
+                    (json.dumps(list(scope)), *(f'$."{f}"' for f in fields)),
+                ).fetchone()
+                is not None
+            )
+
+    def query(
+        self,
+        data_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        scope: Sequence[str] = (),
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answers ``params`` (the same dict the ``fetch`` methods accept) from the
+        store, or returns ``None`` when the stored data does not cover it. The
+        filters are applied locally on the stored fields: ``value`` filters as
+        exact matches and ``range`` filters as inclusive bounds. A filter on a
+        field some stored records lack cannot be answered locally, so it also
+        returns ``None``.
+        """
+        if self.covering(data_type, params, scope) is None:
+            return None
+
+        parameters = get_params(data_type=data_type)
+        canonical = _canonical(params)
+        for name in canonical:
+            if name not in parameters:
+                raise ValueError(f"Invalid parameter: {name!r}.")
+        if canonical and self._lacks_fields(data_type, list(canonical), scope):
+            return None
+
+        clauses, args = ["_scope = ?"], [json.dumps(list(scope))]
+        for name, value in canonical.items():
+            if not isinstance(value, list):
+                clauses.append(f'"{name}" = ?')
+                args.append(value)
+                continue
+            column = (
+                f'"{name}"' if name.endswith("_date") else f'CAST("{name}" AS REAL)'
+            )
+            for op, bound in zip((">=", "<="), value):
+                if bound is not None:
+                    clauses.append(f"{column} {op} ?")
+                    args.append(bound if name.endswith("_date") else float(bound))
+
+        with self._lock:
+            rows = self._db.execute(
+                f'SELECT _record FROM "{self._table(data_type)}" '
+                f"WHERE {' AND '.join(clauses)}",
+                args,
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,207 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, FrozenSet, Optional, Sequence, Tuple, Union
+import gzip
+import random
+import threading
+import time
+
+import requests
+from loguru import logger
+from urllib3.util.request import ACCEPT_ENCODING
+
+Timeout = Union[None, float, Tuple[float, float]]
+
+# Content codings urllib3 can decode here: gzip and deflate, plus br and zstd
+# when their optional packages are installed.
+DECODABLE = tuple(coding.strip() for coding in ACCEPT_ENCODING.split(","))
+
+
+def accept_header(preferred: Sequence[str]) -> str:
+    """
+    Builds an ``Accept-Encoding`` value listing ``preferred`` codings with
+    falling q-values, so the server picks the first it supports. An empty list
+    asks for uncompressed responses.
+    """
+    unsupported = [coding for coding in preferred if coding not in DECODABLE]
+    if unsupported:
+        raise ValueError(
+            f"Cannot decode encodings: {unsupported}. Expected any of {list(DECODABLE)}."
+        )
+    if not preferred:
+        return "identity"
+    return ", ".join(
+        coding if i == 0 else f"{coding};q={1 - i / 10:.1f}"
+        for i, coding in enumerate(dict.fromkeys(preferred))
+    )
+
+
+def wire_bytes(response: requests.Response) -> Optional[int]:
+    """
+    Returns how many bytes of the response body were read off the wire, before
+    any content decoding, or ``None`` when the response does not tell.
+    """
+    tell = getattr(getattr(response, "raw", None), "tell", None)
+    try:
+        return tell() if tell is not None else None
+    except (OSError, ValueError):
+        return None
+
+
+def sent_bytes(response: requests.Response) -> Optional[int]:
+    """
+    Returns the size of the request body as sent, after any compression, or
+    ``None`` when the response does not tell.
+    """
+    body = getattr(getattr(response, "request", None), "body", None)
+    return len(body) if isinstance(body, (bytes, str)) else None
+
+
+class RateLimiter:
+    """
+    Token bucket allowing ``rate`` requests per second on average with bursts of
+    up to ``burst`` requests. Safe to share between threads.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1.")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retries with full-jitter exponential backoff. ``Retry-After`` headers on
+    retryable responses take precedence over the computed delay.
+    """
+
+    total: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 60.0
+    statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    when = parsedate_to_datetime(retry_after)
+                    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+                except (TypeError, ValueError):
+                    pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+class Transport:
+    """
+    Sends requests for the domain clients with timeouts, retries and optional
+    client-side rate limiting. One transport is shared by all domain clients of
+    a ``CheckbookNYC`` so the rate limit applies to all of them together.
+
+    Every API call is a read-only query, so timeouts, connection errors and the
+    statuses in ``retry.statuses`` are safe to retry. A streamed response is only
+    retried before its body starts to be consumed.
+
+    Responses may come in any encoding urllib3 can decode: gzip and deflate,
+    plus brotli and zstd when the ``compression`` extra is installed. They are
+    decoded incrementally as the body is read. ``accept_encoding`` lists the
+    codings to ask for in order of preference, for example ``["zstd", "gzip"]``
+    to favour zstd; ``None`` keeps the session's default header. Request bodies of at
+    least ``compress_requests`` bytes are sent gzip-compressed; leave it at
+    ``None`` for servers that do not accept compressed requests.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        timeout: Timeout = (10.0, 300.0),
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        accept_encoding: Optional[Sequence[str]] = None,
+        compress_requests: Optional[int] = None,
+    ):
+        self.session = session
+        self.timeout = timeout
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.accept_encoding = (
+            None if accept_encoding is None else accept_header(accept_encoding)
+        )
+        self.compress_requests = compress_requests
+
+    def _encode(self, data: str) -> Tuple[Union[str, bytes], Dict[str, str]]:
+        headers = {}
+        if self.accept_encoding:
+            headers["Accept-Encoding"] = self.accept_encoding
+        if self.compress_requests is not None:
+            body = data.encode("utf-8")
+            if len(body) >= self.compress_requests:
+                headers["Content-Encoding"] = "gzip"
+                return gzip.compress(body), headers
+        return data, headers
+
+    def post(
+        self,
+        url: str,
+        data: str,
+        stream: bool = False,
+        on_retry: Optional[Callable[[], None]] = None,
+    ) -> requests.Response:
+        """
+        Posts ``data`` to ``url``, retrying transient failures. ``on_retry`` is
+        called before every retried attempt.
+        """
+        data, headers = self._encode(data)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.post(
+                    url,
+                    data=data,
+                    headers=headers,
+                    stream=stream,
+                    timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.retry.total:
+                    raise
+                delay = self.retry.delay(attempt)
+                logger.warning(f"Request failed ({e}); retrying in {delay:.1f}s.")
+            else:
+                if (
+                    response.status_code not in self.retry.statuses
+                    or attempt >= self.retry.total
+                ):
+                    return response
+                delay = self.retry.delay(attempt, response.headers.get("Retry-After"))
+                response.close()
+                logger.warning(
+                    f"Server returned {response.status_code}; retrying in {delay:.1f}s."
+                )
+            attempt += 1
+            if on_retry is not None:
+                on_retry()
+            time.sleep(delay)
@@ -0,0 +1,62 @@
+import re
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class FakeSession:
+    def __init__(self, content):
+        self.content = content
+        self.posts = 0
+
+    def post(self, url, data=None, headers=None, stream=False, timeout=None):
+        self.posts += 1
+        return FakeResponse(self.content)
+
+
+class PagingSession:
+    """
+    Serves ``total`` synthetic transactions, honouring the ``records_from`` and
+    ``max_records`` of each request. Raises after ``fail_after`` posts.
+    """
+
+    def __init__(self, total, fail_after=None):
+        self.total = total
+        self.fail_after = fail_after
+        self.requests = []
+
+    def post(self, url, data=None, headers=None, stream=False, timeout=None):
+        if self.fail_after is not None and len(self.requests) >= self.fail_after:
+            raise ConnectionError("connection reset")
+        self.requests.append(data)
+        records_from = int(re.search(r"<records_from>(\d+)<", data).group(1))
+        max_records = int(re.search(r"<max_records>(\d+)<", data).group(1))
+        stop = min(self.total, records_from - 1 + max_records)
+        rows = "".join(
+            f"<transaction><document_id>{i}</document_id>"
+            f"<check_amount>{i}.50</check_amount></transaction>"
+            for i in range(records_from - 1, stop)
+        )
+        return FakeResponse(
+            f"<response><transactions>{rows}</transactions></response>".encode()
+        )
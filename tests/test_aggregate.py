@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+import pytest
+
+import checkbooknyc as ck
+from benchmarks.server import MockServer
+from checkbooknyc.aggregate import GroupBy
+
+
+def test_group_by_accumulates_across_pages():
+    group = GroupBy(
+        "Spending",
+        ["agency_code"],
+        {"check_amount": ["sum", "mean", "max"], "issue_date": "min", "*": "count"},
+    )
+    group.update(
+        [
+            {"agency_code": "002", "check_amount": "10.50", "issue_date": "2020-02-01"},
+            {"agency_code": "003", "check_amount": "1,000", "issue_date": None},
+        ]
+    )
+    group.update(
+        [
+            {"agency_code": "002", "check_amount": "n/a", "issue_date": "2020-01-01"},
+            {"agency_code": "002", "check_amount": "4.50"},
+        ]
+    )
+    first, second = group.result()
+    assert first["agency_code"] == "002"
+    assert first["check_amount_sum"] == Decimal("15.00")
+    assert first["check_amount_mean"] == Decimal("7.50")
+    assert first["check_amount_max"] == Decimal("10.50")
+    assert str(first["issue_date_min"]) == "2020-01-01"
+    assert first["count"] == 3
+    assert second["check_amount_sum"] == Decimal("1000")
+    assert second["issue_date_min"] is None
+
+
+def test_group_by_validates_functions():
+    assert GroupBy("Spending", ["agency"], {"check_amount": "sum"}).columns
+    with pytest.raises(ValueError, match="median"):
+        GroupBy("Spending", ["agency_code"], {"check_amount": "median"})
+
+
+def test_aggregate_matches_reduced_records():
+    with MockServer(records=450) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        rows = client.spending.aggregate(
+            ["fiscal_year"], {"check_amount": "sum", "*": "count"}, page_size=100
+        )
+        records = [
+            record
+            for page in client.spending.fetch_all_records(page_size=100)
+            for record in page
+        ]
+    totals = {}
+    for record in records:
+        year = record["fiscal_year"]
+        totals[year] = totals.get(year, 0) + Decimal(record["check_amount"])
+    assert {row["fiscal_year"]: row["check_amount_sum"] for row in rows} == totals
+    assert sum(row["count"] for row in rows) == 450
@@ -0,0 +1,20 @@
+import checkbooknyc as ck
+from benchmarks.run import compare
+from benchmarks.server import MockServer
+
+
+def test_mock_server_pages_like_the_api():
+    with MockServer(records=250, totals={"Contracts": 30}) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        pages = list(client.pages("payroll", page_size=100))
+        contracts = client.contracts.fetch("active", "all", 1, 100)
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert set(pages[0][0]) == set(ck.data_params.PARAMS["Payroll"])
+    assert len(contracts) == 30
+    assert server.requests == 4
+
+
+def test_compare_flags_throughput_drops():
+    baseline = {"a": {"records_per_second": 100.0}, "b": {"records_per_second": 100.0}}
+    current = {"a": {"records_per_second": 95.0}, "b": {"records_per_second": 50.0}}
+    assert compare(current, baseline, threshold=0.1) == ["b"]
@@ -0,0 +1,77 @@
+import zlib
+
+import checkbooknyc as ck
+from checkbooknyc.request import Request
+from tests.fakes import FakeSession
+
+BODY = (
+    b"<response><status><result>success</result></status><transactions>"
+    + b"<transaction><agency_code>002</agency_code></transaction>" * 50
+    + b"</transactions></response>"
+)
+
+
+def test_cache_key_ignores_criteria_order():
+    a = [{"name": "fiscal_year", "type": "value", "value": "2020"}]
+    b = [{"name": "agency_code", "type": "value", "value": "002"}]
+    assert (
+        Request.build("Spending", a + b, 1, 10).digest
+        == Request.build("Spending", b + a, 1, 10).digest
+    )
+
+
+def test_fetch_is_served_from_cache(tmp_path):
+    session = FakeSession(BODY)
+    client = ck.CheckbookNYC(session=session, cache=ck.ResponseCache(tmp_path))
+    first = client.spending.fetch(1, 100, params={"fiscal_year": 2020})
+    second = client.spending.fetch(1, 100, params={"fiscal_year": 2020})
+    streamed = list(
+        client.spending.fetch(1, 100, params={"fiscal_year": 2020}, stream=True)
+    )
+    assert first == second == streamed
+    assert session.posts == 1
+    assert client.cache.stats()["hits"] == 2
+
+
+def test_failures_are_not_cached(tmp_path):
+    session = FakeSession(
+        b"<response><status><result>failure</result></status></response>"
+    )
+    spending = ck.Spending(session, cache=ck.ResponseCache(tmp_path))
+    spending.fetch(1, 100)
+    spending.fetch(1, 100)
+    assert session.posts == 2
+
+
+def test_lru_eviction(tmp_path):
+    cache = ck.ResponseCache(tmp_path, max_bytes=len(zlib.compress(BODY)) * 2)
+    keys = [Request.build("Budget", [], n, 10) for n in (1, 11, 21)]
+    cache.put(keys[0], BODY)
+    cache.put(keys[1], BODY)
+    assert cache.get(keys[0]) == BODY
+    cache.put(keys[2], BODY)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == BODY
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_evicted_during_a_read(tmp_path):
+    cache = ck.ResponseCache(tmp_path, max_bytes=len(zlib.compress(BODY)))
+    first, second = (
+        Request.build("Budget", [], 1, 10),
+        Request.build("Budget", [], 11, 10),
+    )
+    cache.put(first, BODY)
+    chunks = cache.iter_chunks(first, chunk_size=16)
+    cache.put(second, BODY)
+    assert cache.stats()["evictions"] == 1
+    assert b"".join(chunks) == BODY
+
+
+def test_missing_file_is_a_miss(tmp_path):
+    cache = ck.ResponseCache(tmp_path)
+    key = Request.build("Budget", [], 1, 10)
+    cache.put(key, BODY)
+    cache._path(key.digest).unlink()
+    assert cache.get(key) is None
+    assert cache.iter_chunks(key) is None
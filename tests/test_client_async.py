@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from checkbooknyc.client_async import AsyncCheckbookNYC  # noqa: E402
+
+
+def page(n):
+    rows = "".join(
+        f"<transaction><agency_code>{i}</agency_code></transaction>" for i in range(n)
+    )
+    return f"<response><transactions>{rows}</transactions></response>".encode()
+
+
+def test_async_fetch_all_records():
+    sizes = iter([3, 3, 1])
+
+    def handler(request):
+        assert b"<type_of_data>Spending</type_of_data>" in request.content
+        return httpx.Response(200, content=page(next(sizes)))
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncCheckbookNYC(client=client) as ck:
+            pages = [
+                records
+                async for records in ck.spending._paginate(
+                    lambda records_from, max_records: ck.spending.fetch(
+                        records_from, max_records
+                    ),
+                    max_records=3,
+                )
+            ]
+        return [len(records) for records in pages]
+
+    assert asyncio.run(run()) == [3, 3, 1]
+
+
+def test_async_fetch_stream():
+    def handler(request):
+        return httpx.Response(200, content=page(2))
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncCheckbookNYC(client=client) as ck:
+            records = await ck.payroll.fetch(1, 10, stream=True)
+            return [record async for record in records]
+
+    assert asyncio.run(run()) == [{"agency_code": "0"}, {"agency_code": "1"}]
+
+
+def test_async_client_has_connect_and_read_timeouts():
+    async def run():
+        async with AsyncCheckbookNYC() as ck:
+            return ck.client.timeout
+
+    timeout = asyncio.run(run())
+    assert (timeout.connect, timeout.read) == (10.0, 300.0)
+
+
+def test_async_paginate_raises_on_unparsed_body():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=b"<html><br>" + b"x" * 500 + b"</html>")
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncCheckbookNYC(client=client) as ck:
+            async for _ in ck.spending._paginate(
+                lambda records_from, max_records: ck.spending.fetch(
+                    records_from, max_records
+                ),
+                max_records=100,
+            ):
+                pass
+
+    with pytest.raises(ValueError, match="Expected a page of records"):
+        asyncio.run(run())
+    assert len(requests) == 1
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import checkbooknyc as ck
+from checkbooknyc.coalesce import SingleFlight
+from tests.fakes import FakeResponse, FakeSession
+
+BODY = (
+    b"<response><status><result>success</result></status><transactions>"
+    + b"<transaction><agency_code>002</agency_code></transaction>" * 3
+    + b"</transactions></response>"
+)
+
+
+class SlowSession(FakeSession):
+    def __init__(self, content):
+        super().__init__(content)
+        self.release = threading.Event()
+
+    def post(self, url, data=None, headers=None, stream=False, timeout=None):
+        self.posts += 1
+        self.release.wait(5)
+        return FakeResponse(self.content)
+
+
+def test_identical_requests_in_flight_are_sent_once():
+    session = SlowSession(BODY)
+    client = ck.CheckbookNYC(session=session, coalesce=True)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(client.contracts.fetch, "active", "all", 1, 10)
+            for _ in range(4)
+        ]
+        while not client.flights._calls:
+            pass
+        time.sleep(0.2)
+        session.release.set()
+        results = [future.result() for future in futures]
+    assert session.posts == 1
+    assert all(result == results[0] and len(result) == 3 for result in results)
+
+
+def test_memo_serves_bursts_and_skips_failures():
+    session = FakeSession(BODY)
+    client = ck.CheckbookNYC(session=session, memo_ttl=60)
+    client.spending.fetch(1, 10)
+    client.spending.fetch(1, 10, output="typed")
+    assert session.posts == 1
+
+    failure = FakeSession(b"<response><result>failure</result></response>")
+    client = ck.CheckbookNYC(session=failure, memo_ttl=60)
+    client.spending.fetch(1, 10)
+    client.spending.fetch(1, 10)
+    assert failure.posts == 2
+
+
+def test_followers_share_the_leaders_error():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ConnectionError("reset")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flights.do, "key", fail)
+        started.wait(5)
+        follower = executor.submit(flights.do, "key", fail)
+        while not follower.running():
+            pass
+        release.set()
+    for future in (leader, follower):
+        assert isinstance(future.exception(), ConnectionError)
+    assert flights._calls == {}
@@ -0,0 +1,38 @@
+import json
+
+import pandas as pd
+import pytest
+
+import checkbooknyc as ck
+from checkbooknyc.__main__ import main
+from checkbooknyc.export import export
+from tests.fakes import PagingSession
+
+
+def test_export_resumes_from_checkpoint(tmp_path):
+    failing = ck.CheckbookNYC(session=PagingSession(25, fail_after=2))
+    with pytest.raises(ConnectionError):
+        export(failing, "spending", tmp_path, page_size=10)
+    checkpoint = json.loads((tmp_path / "checkpoint.json").read_text())
+    assert checkpoint["records_from"] == 21
+
+    session = PagingSession(25)
+    result = export(
+        ck.CheckbookNYC(session=session), "spending", tmp_path, page_size=10
+    )
+    assert result["complete"] and result["records"] == 25
+    assert len(session.requests) == 1
+    frames = [pd.read_csv(part) for part in sorted(tmp_path.glob("part-*.csv"))]
+    assert pd.concat(frames)["document_id"].tolist() == list(range(25))
+
+
+def test_export_rejects_foreign_checkpoint(tmp_path):
+    client = ck.CheckbookNYC(session=PagingSession(5))
+    export(client, "spending", tmp_path, params={"fiscal_year": 2020})
+    with pytest.raises(ValueError):
+        export(client, "spending", tmp_path, params={"fiscal_year": 2021})
+
+
+def test_cli_rejects_bad_params(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["export", "spending", "--out", str(tmp_path), "--params", "fiscal_year"])
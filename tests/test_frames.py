@@ -0,0 +1,43 @@
+import pytest
+
+import checkbooknyc as ck
+from checkbooknyc._base import ColumnParser
+from tests.fakes import FakeSession
+
+BODY = b"""<response><transactions>
+<transaction><agency>Police</agency><check_amount>10.50</check_amount><issue_date>2020-07-01</issue_date></transaction>
+<transaction><agency>Fire</agency><issue_date>2020-07-02</issue_date></transaction>
+<transaction><agency>Parks</agency><check_amount>7</check_amount><issue_date>2020-07-03</issue_date><payee_name>X</payee_name></transaction>
+</transactions></response>"""
+
+
+def test_column_parser_pads_missing_values():
+    parser = ColumnParser()
+    for i in range(0, len(BODY), 16):
+        parser.feed(BODY[i : i + 16])
+    assert parser.close() == {
+        "agency": ["Police", "Fire", "Parks"],
+        "check_amount": ["10.50", None, "7"],
+        "issue_date": ["2020-07-01", "2020-07-02", "2020-07-03"],
+        "payee_name": [None, None, "X"],
+    }
+
+
+def test_fetch_pandas_types_columns_from_schema():
+    spending = ck.Spending(FakeSession(BODY))
+    df = spending.fetch(1, 100, output="pandas")
+    assert df["check_amount"].sum() == 17.5
+    assert str(df["issue_date"].dtype).startswith("datetime64")
+    assert df["agency"].tolist() == ["Police", "Fire", "Parks"]
+
+
+def test_fetch_arrow():
+    pa = pytest.importorskip("pyarrow")
+    table = ck.Spending(FakeSession(BODY)).fetch(1, 100, output="arrow")
+    assert table.schema.field("check_amount").type == pa.float64()
+    assert table.schema.field("issue_date").type == pa.date32()
+
+
+def test_stream_requires_records_output():
+    with pytest.raises(ValueError):
+        ck.Spending(FakeSession(BODY)).fetch(1, 100, stream=True, output="pandas")
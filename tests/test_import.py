@@ -0,0 +1,34 @@
+import json
+import subprocess
+import sys
+
+HEAVY = ["requests", "loguru", "pandas", "pyarrow", "httpx", "sqlite3", "xml.etree"]
+
+
+def loaded_after(code):
+    script = (
+        f"import sys\n{code}\n"
+        f"print(__import__('json').dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_import_loads_no_heavy_modules():
+    assert loaded_after("import checkbooknyc") == []
+
+
+def test_clients_do_not_load_optional_backends():
+    loaded = loaded_after("import checkbooknyc\ncheckbooknyc.CheckbookNYC()")
+    assert "requests" in loaded
+    assert not {"pandas", "pyarrow", "httpx"} & set(loaded)
+
+
+def test_public_names_resolve():
+    import checkbooknyc
+
+    for name in checkbooknyc.__all__:
+        assert getattr(checkbooknyc, name).__name__ == name
+    assert "Spending" in dir(checkbooknyc)
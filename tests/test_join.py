@@ -0,0 +1,68 @@
+import checkbooknyc as ck
+from benchmarks.server import MockServer
+from checkbooknyc.planner import Shard
+
+
+def expected_join(client):
+    contracts = {
+        record["contract_id"]: record
+        for page in client.pages("contracts", page_size=100)
+        for record in page
+    }
+    return [
+        (record["document_id"], contracts[record["contract_id"]]["current_amount"])
+        for page in client.pages("spending", page_size=100)
+        for record in page
+        if record["contract_id"] in contracts
+    ]
+
+
+def test_hash_join_matches_nested_loop():
+    with MockServer(records=400, totals={"Contracts": 30}) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        joiner = ck.HashJoin(client, pushdown_limit=0, page_size=100)
+        pages = list(
+            joiner.join(Shard("contracts"), Shard("spending"), on="contract_id")
+        )
+        expected = expected_join(client)
+    rows = [row for page in pages for row in page]
+    assert len(pages) == 5
+    assert [(r["document_id"], r["current_amount"]) for r in rows] == expected
+    assert "contracts_fiscal_year" in rows[0]
+
+
+def test_small_build_side_pushes_keys_down():
+    with MockServer(records=400, totals={"Contracts": 3}) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        joiner = ck.HashJoin(client, page_size=100)
+        rows = [
+            row
+            for page in joiner.join(
+                Shard("contracts"),
+                Shard("spending"),
+                on="contract_id",
+                probe_columns=["document_id"],
+            )
+            for row in page
+        ]
+        requests = server.requests
+    assert sorted(row["contract_id"] for row in rows) == sorted(
+        f"CONTRACT ID {n % 1000}" for n in range(3)
+    )
+    assert set(rows[0]) >= {"contract_id", "document_id", "current_amount"}
+    # One build page plus one filtered probe query per contract.
+    assert requests == 1 + 3
+
+
+def test_left_join_keeps_unmatched_rows():
+    with MockServer(records=50, totals={"Contracts": 5}) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        rows = [
+            row
+            for page in ck.HashJoin(client).join(
+                Shard("contracts"), Shard("spending"), on="contract_id", how="left"
+            )
+            for row in page
+        ]
+    assert len(rows) == 50
+    assert sum("current_amount" in row for row in rows) == 5
@@ -0,0 +1,47 @@
+import checkbooknyc as ck
+from benchmarks.server import MockServer
+from checkbooknyc.lookup import Lookup
+
+
+def test_fetch_many_dedupes_and_indexes_by_key():
+    keys = ["DOCUMENT ID 3", "DOCUMENT ID 7", "DOCUMENT ID 3", "DOCUMENT ID 999"]
+    with MockServer(records=400) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        results = client.spending.fetch_many("document_id", keys, workers=4)
+        assert server.requests == 3
+    assert list(results) == ["DOCUMENT ID 3", "DOCUMENT ID 7", "DOCUMENT ID 999"]
+    assert [len(records) for records in results.values()] == [1, 1, 0]
+    assert results["DOCUMENT ID 7"][0]["document_id"] == "DOCUMENT ID 7"
+
+
+def test_fetch_many_reads_covered_keys_from_store():
+    store = ck.LocalStore()
+    cached = {"document_id": "DOCUMENT ID 3", "check_amount": "1.00"}
+    store.upsert("Spending", [cached])
+    store.mark_covered("Spending", {"document_id": "DOCUMENT ID 3"})
+    with MockServer(records=400) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        results = client.spending.fetch_many(
+            "document_id", ["DOCUMENT ID 3", "DOCUMENT ID 7"], store=store
+        )
+        assert server.requests == 1
+    assert results["DOCUMENT ID 3"] == [cached]
+    assert len(results["DOCUMENT ID 7"]) == 1
+
+
+def test_range_keys_share_windowed_queries():
+    lookup = Lookup("Spending", "check_amount", [30, "10.5", 20, 10.5], window=2)
+    queries = lookup.queries({"fiscal_year": 2024}, lookup.values)
+    assert queries == [
+        ({"fiscal_year": 2024, "check_amount": ("10.5", "20")}, ["10.5", "20"]),
+        ({"fiscal_year": 2024, "check_amount": ("30", "30")}, ["30"]),
+    ]
+    lookup.update(
+        ["10.5", "20"],
+        [{"check_amount": "10.50"}, {"check_amount": "15.00"}, {"check_amount": "20"}],
+    )
+    assert lookup.results == {
+        "30": [],
+        "10.5": [{"check_amount": "10.50"}],
+        "20": [{"check_amount": "20"}],
+    }
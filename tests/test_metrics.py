@@ -0,0 +1,71 @@
+import checkbooknyc as ck
+from checkbooknyc.metrics import Hook
+from tests.fakes import FakeResponse, FakeSession, PagingSession
+
+BODY = (
+    b"<response><transactions>"
+    + b"<transaction><agency_code>002</agency_code></transaction>" * 5
+    + b"</transactions></response>"
+)
+
+
+class Recorder(Hook):
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_request_start(self, event):
+        self.started.append(event)
+
+    def on_request_end(self, event):
+        self.ended.append(event)
+
+
+def test_hooks_see_every_page():
+    recorder = Recorder()
+    client = ck.CheckbookNYC(session=PagingSession(25), hooks=[recorder])
+    list(client.pages("spending", page_size=10))
+    assert len(recorder.started) == len(recorder.ended) == 3
+    assert [e.records for e in recorder.ended] == [10, 10, 5]
+    assert all(e.response_bytes > 0 and e.request_bytes > 0 for e in recorder.ended)
+    assert all(e.error is None for e in recorder.ended)
+
+
+def test_streamed_request_ends_when_stream_is_consumed():
+    recorder = Recorder()
+    spending = ck.Spending(FakeSession(BODY), hooks=[recorder])
+    records = spending.fetch(1, 100, stream=True)
+    assert recorder.ended == []
+    assert len(list(records)) == 5
+    (event,) = recorder.ended
+    assert event.records == 5
+    assert event.response_bytes == len(BODY)
+
+
+class FlakySession(FakeSession):
+    def post(self, url, data=None, headers=None, stream=False, timeout=None):
+        self.posts += 1
+        if self.posts == 1:
+            return FakeResponse(b"", status_code=503, headers={"Retry-After": "0"})
+        return FakeResponse(self.content)
+
+
+def test_metrics_prometheus_text():
+    metrics = ck.Metrics()
+    client = ck.CheckbookNYC(session=FlakySession(BODY), hooks=[metrics])
+    client.budget.fetch(1, 100)
+    text = metrics.to_prometheus()
+    assert 'checkbooknyc_requests_total{data_type="Budget"} 1' in text
+    assert 'checkbooknyc_retries_total{data_type="Budget"} 1' in text
+    assert 'checkbooknyc_records_total{data_type="Budget"} 5' in text
+    assert 'checkbooknyc_records_per_page_bucket{data_type="Budget",le="10"} 1' in text
+    assert 'checkbooknyc_parse_seconds_count{data_type="Budget"} 1' in text
+
+
+def test_metrics_prometheus_values_keep_every_digit():
+    metrics = ck.Metrics()
+    metrics.counters["response_bytes_total"]["Budget"] = 1_234_567_891.0
+    metrics.histograms["parse_seconds"]["Budget"].observe(1234.5678912)
+    text = metrics.to_prometheus()
+    assert 'checkbooknyc_response_bytes_total{data_type="Budget"} 1234567891' in text
+    assert 'checkbooknyc_parse_seconds_sum{data_type="Budget"} 1234.5678912' in text
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+import checkbooknyc as ck
+from checkbooknyc.paging import estimate_bytes
+from requests import Session
+
+
+def fake_pages(total):
+    calls = []
+
+    def fetch_page(records_from, max_records):
+        calls.append(records_from)
+        start = records_from - 1
+        return [{"n": i} for i in range(start, min(start + max_records, total))]
+
+    return fetch_page, calls
+
+
+def test_paginate_serial():
+    fetch_page, calls = fake_pages(25)
+    pages = list(ck.Budget(session=Session())._paginate(fetch_page, page_size=10))
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert calls == [1, 11, 21]
+
+
+def test_paginate_concurrent_keeps_order():
+    fetch_page, _ = fake_pages(95)
+    pages = ck.Budget(session=Session())._paginate(fetch_page, page_size=10, workers=4)
+    records = [r["n"] for page in pages for r in page]
+    assert records == list(range(95))
+
+
+def test_paginate_adaptive_grows_window():
+    fetch_page, calls = fake_pages(1_000)
+    policy = ck.AdaptivePageSize(initial=100, min_size=10, max_size=400)
+    pages = list(ck.Budget(session=Session())._paginate(fetch_page, page_size=policy))
+    assert sum(len(p) for p in pages) == 1_000
+    assert calls[:4] == [1, 101, 301, 701]
+
+
+def test_adaptive_page_size_shrinks_slow_pages():
+    policy = ck.AdaptivePageSize(initial=1_000, target_seconds=1.0)
+    policy.record(1_000, 1_000, 4.0)
+    assert policy.next() == 500
+    policy.record(500, 500, 0.5)
+    assert policy.next() == 1_000
+
+
+def test_paginate_prefetch_keeps_order():
+    fetch_page, calls = fake_pages(95)
+    pages = ck.Budget(session=Session())._paginate(fetch_page, page_size=10, prefetch=3)
+    records = [r["n"] for page in pages for r in page]
+    assert records == list(range(95))
+    assert calls == list(range(1, 96, 10))
+
+
+def test_paginate_prefetch_bounds_read_ahead():
+    fetch_page, calls = fake_pages(1_000)
+    pages = ck.Budget(session=Session())._paginate(fetch_page, page_size=10, prefetch=3)
+    next(pages)
+    time.sleep(0.2)
+    # One page consumed and three buffered; the reader waits for room.
+    assert len(calls) == 4
+    pages.close()
+
+
+def test_paginate_prefetch_byte_budget():
+    fetch_page, calls = fake_pages(1_000)
+    page_bytes = estimate_bytes(fetch_page(1, 10))
+    calls.clear()
+    pages = ck.Budget(session=Session())._paginate(
+        fetch_page, page_size=10, prefetch=10, prefetch_bytes=2 * page_bytes
+    )
+    next(pages)
+    time.sleep(0.2)
+    assert len(calls) == 3
+    pages.close()
+
+
+def test_paginate_prefetch_raises_after_earlier_pages():
+    def fetch_page(records_from, max_records):
+        if records_from > 10:
+            raise RuntimeError("boom")
+        return [{"n": 0}] * max_records
+
+    pages = ck.Budget(session=Session())._paginate(fetch_page, page_size=10, prefetch=2)
+    assert len(next(pages)) == 10
+    try:
+        next(pages)
+    except RuntimeError as e:
+        assert str(e) == "boom"
+    else:
+        raise AssertionError("expected the fetch error")
+
+
+def test_paginate_raises_on_unparsed_body():
+    def fetch_page(records_from, max_records):
+        return "<html>" + "x" * 500 + "</html>"
+
+    pages = ck.Budget(session=Session())._paginate(fetch_page, page_size=100)
+    with pytest.raises(ValueError, match="Expected a page of records"):
+        next(pages)
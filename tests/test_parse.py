@@ -0,0 +1,91 @@
+import pytest
+
+import checkbooknyc as ck
+from loguru import logger
+from requests import Session
+
+XML = b"""<?xml version="1.0"?>
+<response>
+    <status><result>success</result></status>
+    <result_records>
+        <record_count>3</record_count>
+        <transactions>
+            <transaction><agency>Police</agency><check_amount>10.50</check_amount></transaction>
+            <transaction><agency>Fire</agency><check_amount>7</check_amount></transaction>
+            <transaction><agency>Parks</agency><check_amount></check_amount></transaction>
+        </transactions>
+    </result_records>
+</response>
+"""
+
+
+def test_iter_parse_matches_parse():
+    spending = ck.Spending(session=Session())
+    chunks = (XML[i : i + 7] for i in range(0, len(XML), 7))
+    assert list(spending._iter_parse(chunks)) == spending._parse(XML.decode("utf-8"))
+
+
+def test_iter_parse_yields_incrementally():
+    spending = ck.Spending(session=Session())
+    records = spending._iter_parse([XML])
+    assert next(records) == {"agency": "Police", "check_amount": "10.50"}
+    assert len(list(records)) == 2
+
+
+def test_projection_skips_other_fields():
+    spending = ck.Spending(session=Session())
+    chunks = (XML[i : i + 7] for i in range(0, len(XML), 7))
+    parser = ck._base.TransactionParser(["check_amount"])
+    assert list(spending._iter_parse(chunks, parser)) == [
+        {"check_amount": "10.50"},
+        {"check_amount": "7"},
+        {"check_amount": None},
+    ]
+    assert spending._parse_columns([XML], ["agency"]) == {
+        "agency": ["Police", "Fire", "Parks"]
+    }
+
+
+WIDE = (
+    b"<response><transactions>"
+    + b"".join(
+        f"<transaction><a>{n}</a><b>{n + 1}</b><c>{n + 2}</c><d>{n + 3}</d>"
+        "</transaction>".encode()
+        for n in (1, 5)
+    )
+    + b"</transactions></response>"
+)
+
+
+@pytest.mark.parametrize("size", [len(WIDE), 5])
+def test_projection_keeps_middle_fields(size):
+    chunks = [WIDE[i : i + size] for i in range(0, len(WIDE), size)]
+    parser = ck._base.TransactionParser(["b", "c"])
+    records = [r for chunk in chunks for r in parser.feed(chunk)]
+    records += list(parser.close())
+    assert records == [{"b": "2", "c": "3"}, {"b": "6", "c": "7"}]
+
+    parser = ck._base.ColumnParser(["b", "c"])
+    for chunk in chunks:
+        parser.feed(chunk)
+    assert parser.close() == {"b": ["2", "6"], "c": ["3", "7"]}
+
+
+def test_response_columns_are_checked():
+    spending = ck.Spending(session=Session())
+    assert spending._columns(["issue_date", "check_amount", "issue_date"]) == [
+        "issue_date",
+        "check_amount",
+    ]
+    warnings = []
+    sink = logger.add(warnings.append, level="WARNING")
+    try:
+        # Unknown columns may still be valid response tags, so they are sent.
+        assert spending._columns(["agency", "check_amont"]) == [
+            "agency",
+            "check_amont",
+        ]
+    finally:
+        logger.remove(sink)
+    assert len(warnings) == 1
+    assert "check_amount" in warnings[0]
@@ -0,0 +1,23 @@
+import checkbooknyc as ck
+from tests.fakes import PagingSession
+
+
+def test_pipeline_matches_serial_parse():
+    serial = ck.Spending(PagingSession(250))
+    piped = ck.Spending(PagingSession(250))
+    expected = list(serial.fetch_all_records(page_size=100))
+    pages = list(piped.fetch_all_records(page_size=100, processes=2))
+    assert pages == expected
+    assert [len(page) for page in pages] == [100, 100, 50]
+
+
+def test_pipeline_typed_records():
+    expected = ck.Payroll(PagingSession(30)).fetch_all_records(
+        page_size=20, output="typed"
+    )
+    pages = ck.Payroll(PagingSession(30)).fetch_all_records(
+        page_size=20, output="typed", processes=1
+    )
+    records = [record for page in pages for record in page]
+    assert records == [record for page in expected for record in page]
+    assert [record.document_id for record in records] == [str(n) for n in range(30)]
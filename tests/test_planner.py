@@ -0,0 +1,48 @@
+import pytest
+
+import checkbooknyc as ck
+from checkbooknyc.planner import amount_ranges, date_ranges
+from tests.fakes import PagingSession
+
+
+def test_date_ranges_are_adjacent():
+    assert date_ranges("2023-07-01", "2023-07-10", 3) == [
+        ("2023-07-01", "2023-07-03"),
+        ("2023-07-04", "2023-07-06"),
+        ("2023-07-07", "2023-07-10"),
+    ]
+
+
+def test_amount_ranges_do_not_overlap():
+    assert amount_ranges(0, 100, 4) == [
+        (0, 24.99),
+        (25, 49.99),
+        (50, 74.99),
+        (75, 100),
+    ]
+
+
+def test_plan_save_load_run(tmp_path):
+    session = PagingSession(3)
+    planner = ck.QueryPlanner(ck.CheckbookNYC(session=session))
+    shards = planner.plan(
+        "spending",
+        {"agency_code": "002"},
+        by={
+            "fiscal_year": [2022, 2023],
+            "issue_date": date_ranges("2022-07-01", "2023-06-30", 2),
+        },
+    )
+    assert len(shards) == 4
+    planner.save(shards, tmp_path / "shards.json")
+    assert planner.load(tmp_path / "shards.json") == shards
+
+    records = planner.run(shards, workers=2)
+    assert len(records) == 12
+    assert all("<start>" in body and "<end>" in body for body in session.requests)
+
+
+def test_plan_rejects_unknown_split():
+    planner = ck.QueryPlanner(ck.CheckbookNYC(session=PagingSession(0)))
+    with pytest.raises(ValueError):
+        planner.plan("spending", by={"fiscal_yr": [2022]})
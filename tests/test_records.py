@@ -0,0 +1,27 @@
+from datetime import date
+from decimal import Decimal
+
+import checkbooknyc as ck
+from checkbooknyc.records import record_type
+from tests.fakes import FakeSession
+
+BODY = b"""<response><transactions>
+<transaction><fiscal_year>2020</fiscal_year><gross_pay>1,250.75</gross_pay><pay_date>2020-01-15</pay_date><title>CLERK</title></transaction>
+<transaction><fiscal_year>2020</fiscal_year><gross_pay>99</gross_pay><pay_date>2020-01-31</pay_date><title>CLERK</title><employee_number>7</employee_number></transaction>
+</transactions></response>"""
+
+
+def test_record_type_uses_slots():
+    PayrollRecord = record_type("Payroll")
+    record = PayrollRecord(title="CLERK")
+    assert not hasattr(record, "__dict__")
+    assert record.title == "CLERK" and record.amount is None
+
+
+def test_fetch_typed_converts_values():
+    records = ck.Payroll(FakeSession(BODY)).fetch(1, 100, output="typed")
+    assert records[0].gross_pay == Decimal("1250.75")
+    assert records[0].pay_date == date(2020, 1, 15)
+    assert records[0].fiscal_year == 2020
+    assert records[1].extra == {"employee_number": "7"}
+    assert isinstance(records[0], ck.Record)
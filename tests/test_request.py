@@ -0,0 +1,33 @@
+from xml.etree import ElementTree as ET
+
+from checkbooknyc.request import Request
+
+
+def test_request_xml_is_minimal_and_escaped():
+    request = Request.build(
+        "Spending",
+        [
+            {"name": "payee_name", "type": "value", "value": "A & B <LLC>"},
+            {"name": "issue_date", "type": "range", "start": "2020-01-01"},
+        ],
+        1,
+        10,
+        ["agency"],
+    )
+    xml = request.xml
+    assert "\n" not in xml
+    root = ET.fromstring(xml)
+    assert root.findtext("type_of_data") == "Spending"
+    assert root.findtext("max_records") == "10"
+    criteria = {c.findtext("name"): c for c in root.iter("criteria")}
+    assert criteria["payee_name"].findtext("value") == "A & B <LLC>"
+    assert criteria["issue_date"].findtext("start") == "2020-01-01"
+    assert criteria["issue_date"].find("end") is None
+    assert [c.text for c in root.iter("column")] == ["agency"]
+
+
+def test_request_is_hashable_and_order_independent():
+    a = {"name": "fiscal_year", "type": "value", "value": "2020"}
+    b = {"name": "agency_code", "type": "value", "value": "002"}
+    assert Request.build("Budget", [a, b]) == Request.build("Budget", [b, a])
+    assert len({Request.build("Budget", [a, b]), Request.build("Budget", [b, a])}) == 1
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+import checkbooknyc as ck
+from benchmarks.server import MockServer
+from requests import Session
+
+DATA_TYPES = ["payroll", "budget", "contracts", "revenue", "spending"]
+
+
+def test_jobs_run_concurrently_and_stream_back():
+    with MockServer(records=250, latency=0.1) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        jobs = [ck.Job(data_type, page_size=100) for data_type in DATA_TYPES]
+        start = time.perf_counter()
+        results = list(client.run(jobs, concurrency=5))
+        elapsed = time.perf_counter() - start
+    assert sorted(r.job.data_type for r in results) == sorted(DATA_TYPES)
+    assert all(r.error is None and len(r.result) == 250 for r in results)
+    # Each job takes three sequential requests; run one after another the
+    # batch would take five times as long.
+    assert elapsed < sum(r.seconds for r in results) / 2
+
+
+def test_small_queries_go_first_and_endpoint_limits_hold():
+    with MockServer(records=50) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        jobs = [
+            ck.Job("spending", page_size=20, name="bulk-1"),
+            ck.Job("spending", page_size=20, name="bulk-2"),
+            ck.Job("payroll", max_records=5, name="small"),
+        ]
+        results = list(client.run(jobs, concurrency=1))
+    assert [r.job.name for r in results] == ["small", "bulk-1", "bulk-2"]
+    assert len(results[0].result) == 5
+
+
+def test_failed_job_does_not_stop_the_batch():
+    with MockServer(records=10) as server:
+        client = ck.CheckbookNYC(base_url=server.url)
+        jobs = [
+            ck.Job("spending", params={"no_such_filter": 1}),
+            ck.Job("budget"),
+        ]
+        results = {
+            r.job.data_type: r for r in client.run(jobs, per_endpoint={"budget": 1})
+        }
+    assert isinstance(results["spending"].error, ValueError)
+    assert len(results["budget"].result) == 10
+
+
+class InFlight(ck.Hook):
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def on_request_start(self, event):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def on_request_end(self, event):
+        with self.lock:
+            self.active -= 1
+
+
+def test_per_endpoint_limit():
+    hook = InFlight()
+    with MockServer(records=60, latency=0.05) as server:
+        client = ck.CheckbookNYC(base_url=server.url, hooks=[hook])
+        jobs = [ck.Job("spending", page_size=20) for _ in range(3)]
+        list(client.run(jobs, concurrency=3, per_endpoint={"spending": 1}))
+    assert hook.peak == 1
+
+
+def test_endpoint_limits_must_be_positive():
+    client = ck.CheckbookNYC(session=Session())
+    with pytest.raises(ValueError, match="per_endpoint"):
+        ck.Scheduler(client, per_endpoint={"spending": 0})
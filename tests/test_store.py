@@ -0,0 +1,81 @@
+import checkbooknyc as ck
+from tests.fakes import FakeResponse
+
+
+class SpendingSession:
+    def __init__(self):
+        self.posts = 0
+
+    def post(self, url, data=None, headers=None, stream=False, timeout=None):
+        self.posts += 1
+        rows = "".join(
+            f"<transaction><agency_code>{a}</agency_code><fiscal_year>2024</fiscal_year>"
+            f"<check_amount>{amount}</check_amount></transaction>"
+            for a, amount in [("002", "10"), ("002", "250.5"), ("003", "99")]
+        )
+        return FakeResponse(f"<response>{rows}</response>".encode())
+
+
+def test_pager_writes_through_and_store_answers_narrower_queries():
+    session = SpendingSession()
+    client = ck.CheckbookNYC(session=session)
+    store = ck.LocalStore()
+
+    pages = list(
+        client.spending.fetch_all_records(params={"fiscal_year": 2024}, store=store)
+    )
+    assert len(pages[0]) == 3 and session.posts == 1
+
+    assert len(store.query("Spending", {"fiscal_year": 2024})) == 3
+    assert (
+        len(store.query("Spending", {"fiscal_year": 2024, "agency_code": "002"})) == 2
+    )
+    narrow = store.query("Spending", {"fiscal_year": 2024, "check_amount": (50, None)})
+    assert sorted(r["check_amount"] for r in narrow) == ["250.5", "99"]
+    assert store.query("Spending", {"fiscal_year": 2023}) is None
+    assert store.query("Spending") is None
+
+
+def test_indexes_on_common_filter_keys():
+    store = ck.LocalStore()
+    store.upsert("Payroll", [{"agency_code": "002"}])
+    indexes = {
+        row[0]
+        for row in store._db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    assert {"payroll_agency_code", "payroll_fiscal_year"} <= indexes
+
+
+def test_projected_pages_do_not_add_partial_rows_or_coverage():
+    client = ck.CheckbookNYC(session=SpendingSession())
+    store = ck.LocalStore()
+    list(client.spending.fetch_all_records(store=store))
+    list(
+        client.spending.fetch_all_records(
+            response_columns=["check_amount"], params={"fiscal_year": 2024}, store=store
+        )
+    )
+    assert len(store.query("Spending")) == 3
+    assert store.query("Spending", {"fiscal_year": 2024}) is not None
+    assert store.covering("Spending", {"agency_code": "002"}) == {}
+
+
+def test_projected_records_merge_by_natural_key():
+    store = ck.LocalStore()
+    store.upsert("Contracts", [{"contract_id": "CT1", "vendor_code": "V1"}])
+    store.upsert(
+        "Contracts", [{"contract_id": "CT1", "current_amount": "2"}], merge=True
+    )
+    assert list(store.records("Contracts")) == [
+        {"contract_id": "CT1", "vendor_code": "V1", "current_amount": "2"}
+    ]
+
+
+def test_query_misses_when_filtered_field_is_not_stored():
+    store = ck.LocalStore()
+    store.upsert("Spending", [{"check_amount": "10"}])
+    store.mark_covered("Spending")
+    assert store.query("Spending", {"agency_code": "002"}) is None
+    assert store.query("Spending") == [{"check_amount": "10"}]
@@ -0,0 +1,51 @@
+import re
+
+import checkbooknyc as ck
+from tests.fakes import FakeResponse
+
+
+class LedgerSession:
+    """Serves Spending rows, honouring an issue_date start criterion."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def post(self, url, data=None, headers=None, stream=False, timeout=None):
+        self.requests.append(data)
+        start = re.search(r"<start>([\d-]+)</start>", data)
+        rows = [r for r in self.rows if not start or r[1] >= start.group(1)]
+        body = "".join(
+            f"<transaction><document_id>{d}</document_id><issue_date>{i}</issue_date>"
+            "</transaction>"
+            for d, i in rows
+        )
+        return FakeResponse(f"<response>{body}</response>".encode())
+
+
+def test_sync_fetches_only_new_records():
+    session = LedgerSession([("A", "2024-01-01"), ("B", "2024-01-02")])
+    client = ck.CheckbookNYC(session=session)
+    store = ck.LocalStore()
+
+    assert client.spending.sync(store, {"fiscal_year": 2024}) == 2
+    assert "<start>" not in session.requests[-1]
+
+    session.rows.append(("C", "2024-01-03"))
+    assert client.spending.sync(store, {"fiscal_year": 2024}) == 2
+    assert "<start>2024-01-02</start>" in session.requests[-1]
+    assert store.count("Spending") == 3
+    assert sorted(r["document_id"] for r in store.records("Spending")) == [
+        "A",
+        "B",
+        "C",
+    ]
+
+
+def test_sync_natural_key_replaces_records():
+    store = ck.LocalStore()
+    store.upsert("Contracts", [{"contract_id": "CT1", "current_amount": "1"}])
+    store.upsert("Contracts", [{"contract_id": "CT1", "current_amount": "2"}])
+    assert list(store.records("Contracts")) == [
+        {"contract_id": "CT1", "current_amount": "2"}
+    ]
@@ -0,0 +1,111 @@
+import time
+
+import pytest
+import requests
+
+import checkbooknyc as ck
+from benchmarks.server import MockServer
+from checkbooknyc.transport import RateLimiter, RetryPolicy, Transport
+from tests.fakes import FakeResponse
+
+
+class FlakySession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    def post(self, url, data=None, headers=None, stream=False, timeout=None):
+        self.timeouts.append(timeout)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_retries_transient_failures():
+    session = FlakySession(
+        [
+            requests.ConnectionError("reset"),
+            FakeResponse(b"", 503, {"Retry-After": "0"}),
+            FakeResponse(b"ok"),
+        ]
+    )
+    transport = Transport(session, timeout=(1, 2), retry=RetryPolicy(backoff=0))
+    assert transport.post("http://api", "<request/>").content == b"ok"
+    assert session.timeouts == [(1, 2)] * 3
+
+
+def test_gives_up_after_total_retries():
+    session = FlakySession([requests.Timeout("slow")] * 3)
+    transport = Transport(session, retry=RetryPolicy(total=2, backoff=0))
+    with pytest.raises(requests.Timeout):
+        transport.post("http://api", "<request/>")
+
+
+def test_retry_after_takes_precedence():
+    assert RetryPolicy().delay(5, "7") == 7.0
+    assert 0 <= RetryPolicy(backoff=1, max_backoff=4).delay(10) <= 4
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_compressed_responses_and_requests():
+    metrics = ck.Metrics()
+    with MockServer(records=500, compress=True) as server:
+        client = ck.CheckbookNYC(
+            base_url=server.url, hooks=[metrics], compress_requests=0
+        )
+        pages = list(client.pages("spending", page_size=200))
+        streamed = list(client.spending.fetch(1, 200, stream=True))
+    assert [len(page) for page in pages] == [200, 200, 100]
+    assert streamed == pages[0]
+    counters = metrics.counters
+    assert (
+        counters["response_wire_bytes_total"]["Spending"]
+        < counters["response_bytes_total"]["Spending"] / 3
+    )
+    assert (
+        counters["request_wire_bytes_total"]["Spending"]
+        != counters["request_bytes_total"]["Spending"]
+    )
+    assert metrics.compression_ratios()["Spending"] > 3
+    assert "checkbooknyc_response_compression_ratio" in metrics.to_prometheus()
+
+
+class HeaderSession:
+    def __init__(self):
+        self.headers = []
+
+    def post(self, url, data=None, headers=None, stream=False, timeout=None):
+        self.headers.append(headers)
+        return FakeResponse(b"<response/>")
+
+
+def test_accept_encoding_preference():
+    session = HeaderSession()
+    Transport(session).post("http://x", "<request/>")
+    Transport(session, accept_encoding=["deflate", "gzip"]).post("http://x", "")
+    Transport(session, accept_encoding=[]).post("http://x", "")
+    assert [h.get("Accept-Encoding") for h in session.headers] == [
+        None,
+        "deflate, gzip;q=0.9",
+        "identity",
+    ]
+    with pytest.raises(ValueError, match="lzma"):
+        Transport(session, accept_encoding=["lzma"])
+
+
+def test_uncompressed_responses_on_request():
+    metrics = ck.Metrics()
+    with MockServer(records=50, compress=True) as server:
+        client = ck.CheckbookNYC(
+            base_url=server.url, hooks=[metrics], accept_encoding=[]
+        )
+        list(client.pages("spending"))
+    assert metrics.compression_ratios()["Spending"] == 1